@@ -0,0 +1,192 @@
+"""
+Single-copy episode assembly.
+
+The old scripts padded every segment with ``add_pause`` (a float64
+``np.zeros`` plus ``np.concatenate``, which also promoted the model's
+float32 audio) and then concatenated everything again, copying each sample
+at least twice. Here the episode length is computed up front from segment
+lengths and the per-role pauses in the script's VOICES map, one float32
+buffer (or an on-disk memmap for long episodes) is allocated, and every
+segment is written straight into its slice. Pauses are the buffer's zeros.
+
+    python assembly.py --segments 240 --seconds 15
+"""
+import argparse
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from audio_dsp import measure_call
+
+
+def pause_samples(sample_rate, seconds):
+    return int(sample_rate * seconds)
+
+
+def episode_offsets(lengths, pauses, sample_rate):
+    """Start sample of every segment and the total episode length."""
+    offsets = []
+    total = 0
+    for length, pause in zip(lengths, pauses):
+        offsets.append(total)
+        total += length + pause_samples(sample_rate, pause)
+    return offsets, total
+
+
+def assemble(wavs, pauses, sample_rate, memmap_path=None):
+    """
+    Lay ``wavs`` out back to back, each followed by its pause, in one float32
+    buffer. Returns ``(audio, offsets)``; ``audio`` is a ``np.memmap`` when
+    ``memmap_path`` is given.
+    """
+    offsets, total = episode_offsets([len(wav) for wav in wavs], pauses, sample_rate)
+    if memmap_path is not None:
+        audio = np.lib.format.open_memmap(memmap_path, mode="w+", dtype=np.float32, shape=(total,))
+    else:
+        audio = np.zeros(total, dtype=np.float32)
+
+    for wav, offset in zip(wavs, offsets):
+        audio[offset:offset + len(wav)] = wav
+    if memmap_path is not None:
+        audio.flush()
+    return audio, offsets
+
+
+# =============================
+# ON-DISK EPISODE BUFFER
+# =============================
+class EpisodeBuffer:
+    """
+    Multi-hour episodes without holding them in RAM.
+
+    Segments are appended as raw float32 PCM to ``<directory>/episode.f32``
+    with their offsets and content keys in ``index.json``; ``export`` streams
+    the result into a WAV/FLAC in blocks and ``replace`` overwrites one
+    segment in place through a memmap when its length is unchanged.
+    """
+
+    EXPORT_BLOCK_SECONDS = 60
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.raw_path = os.path.join(directory, "episode.f32")
+        self.index_path = os.path.join(directory, "index.json")
+        os.makedirs(directory, exist_ok=True)
+
+        self.sample_rate = None
+        self.segments = {}
+        self.frames = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                index = json.load(f)
+            self.sample_rate = index["sample_rate"]
+            self.frames = index["frames"]
+            self.segments = {int(key): value for key, value in index["segments"].items()}
+            # Drop anything written after the last recorded segment.
+            with open(self.raw_path, "r+b") as f:
+                f.truncate(self.frames * 4)
+        else:
+            open(self.raw_path, "wb").close()
+
+    def _save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "sample_rate": self.sample_rate,
+                "frames": self.frames,
+                "segments": self.segments,
+            }, f)
+        os.replace(tmp, self.index_path)
+
+    def append(self, index, wav, sample_rate, pause=0.0, key=None):
+        if self.sample_rate is None:
+            self.sample_rate = sample_rate
+        elif sample_rate != self.sample_rate:
+            raise ValueError(f"Segment {index} is {sample_rate} Hz, episode is {self.sample_rate} Hz")
+
+        gap = pause_samples(sample_rate, pause)
+        with open(self.raw_path, "ab") as f:
+            f.write(np.asarray(wav, dtype=np.float32).tobytes())
+            f.write(np.zeros(gap, dtype=np.float32).tobytes())
+        self.segments[index] = {"offset": self.frames, "length": len(wav), "pause": gap, "key": key}
+        self.frames += len(wav) + gap
+        self._save_index()
+
+    def truncate(self, frames):
+        """Drop every segment that starts at or after sample ``frames``, and its audio."""
+        self.segments = {index: segment for index, segment in self.segments.items()
+                         if segment["offset"] < frames}
+        self.frames = frames
+        with open(self.raw_path, "r+b") as f:
+            f.truncate(frames * 4)
+        self._save_index()
+
+    def audio(self, mode="r"):
+        """The whole episode as a float32 memmap (nothing is read until sliced)."""
+        return np.memmap(self.raw_path, dtype=np.float32, mode=mode, shape=(self.frames,))
+
+    def replace(self, index, wav):
+        """Overwrite segment ``index`` in place; only same-length audio fits."""
+        segment = self.segments[index]
+        if len(wav) != segment["length"]:
+            raise ValueError(
+                f"Segment {index} is {segment['length']} samples, replacement is {len(wav)}; "
+                "re-render the episode to change its length"
+            )
+        view = np.memmap(self.raw_path, dtype=np.float32, mode="r+",
+                         offset=segment["offset"] * 4, shape=(segment["length"],))
+        view[:] = wav
+        view.flush()
+
+    def export(self, path):
+        """Write WAV/FLAC (format from the extension) one block at a time."""
+        import soundfile as sf
+
+        audio = self.audio()
+        block = self.sample_rate * self.EXPORT_BLOCK_SECONDS
+        with sf.SoundFile(path, "w", samplerate=self.sample_rate, channels=1) as f:
+            for start in range(0, self.frames, block):
+                f.write(np.asarray(audio[start:start + block]))
+        return path
+
+
+# =============================
+# BENCHMARK
+# =============================
+def _legacy(wavs, pauses, sample_rate):
+    padded = []
+    for wav, pause in zip(wavs, pauses):
+        padded.append(np.concatenate([wav, np.zeros(int(sample_rate * pause))]))
+    return np.concatenate(padded)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare add_pause+concatenate with preallocated assembly.")
+    parser.add_argument("--segments", type=int, default=240)
+    parser.add_argument("--seconds", type=float, default=15.0, help="Average segment length.")
+    parser.add_argument("--sr", type=int, default=24000)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    lengths = (rng.uniform(0.3, 1.7, args.segments) * args.seconds * args.sr).astype(int)
+    wavs = [rng.standard_normal(n, dtype=np.float32) * 0.1 for n in lengths]
+    pauses = [0.18 if i % 2 == 0 else 0.40 for i in range(args.segments)]
+    print(f"{args.segments} segments, {sum(lengths) / args.sr / 60:.0f} min of audio "
+          f"({sum(lengths) * 4 / 1024 ** 2:.0f} MB float32 input)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = {
+            "add_pause + concatenate": lambda: _legacy(wavs, pauses, args.sr),
+            "preallocated float32": lambda: assemble(wavs, pauses, args.sr)[0],
+            "memmap": lambda: assemble(wavs, pauses, args.sr, os.path.join(tmp, "episode.npy"))[0],
+        }
+        for name, fn in runs.items():
+            out, elapsed, peak = measure_call(fn)
+            print(f"{name:<24} {elapsed:6.2f}s  peak alloc {peak / 1024 ** 2:8.1f} MB  {out.dtype}")
+            del out
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Tempo change for rendered speech.
+
+pod_nomura_jp1.py used to speed speech up by picking samples from a
+``np.arange(0, len(wav), factor)`` index array: that allocates a float index
+the size of the waveform, raises the pitch and aliases. Two replacements:
+
+- ``resample``: pitch-coupled speed-up through soxr's streaming resampler
+  (band-limited, so no aliasing), fed in fixed-size chunks.
+- ``wsola``: pitch-preserving time stretch (waveform-similarity overlap-add)
+  with a vectorised similarity search and a preallocated output buffer.
+
+Benchmark both against the old decimation with:
+
+    python audio_dsp.py --seconds 1800
+    python audio_dsp.py --input podcast_output/podcast_nomura_jp1.wav
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+# =============================
+# CONFIG
+# =============================
+TEMPO_METHODS = ("resample", "wsola")
+CHUNK_SECONDS = 10.0
+WSOLA_FRAME_SECONDS = 0.02
+WSOLA_TOLERANCE_SECONDS = 0.01
+
+
+def decimate_speed_up(wav, factor=1.05):
+    """The original pod_nomura_jp1.py implementation, kept as the benchmark baseline."""
+    indices = np.round(np.arange(0, len(wav), factor))
+    indices = indices[indices < len(wav)].astype(int)
+    return wav[indices]
+
+
+def resample_speed_up(wav, sr, factor, chunk_seconds=CHUNK_SECONDS):
+    """Play ``factor`` times faster (pitch rises with it), band-limited by soxr."""
+    import soxr
+
+    wav = np.asarray(wav, dtype=np.float32)
+    stream = soxr.ResampleStream(sr * factor, sr, 1, dtype="float32", quality="HQ")
+    out = np.empty(int(np.ceil(len(wav) / factor)) + 64, dtype=np.float32)
+    step = max(1, int(sr * chunk_seconds))
+    written = 0
+    for start in range(0, len(wav), step):
+        chunk = stream.resample_chunk(wav[start:start + step], last=start + step >= len(wav))
+        out[written:written + len(chunk)] = chunk
+        written += len(chunk)
+    return out[:written]
+
+
+def wsola(wav, sr, factor, frame_seconds=WSOLA_FRAME_SECONDS, tolerance_seconds=WSOLA_TOLERANCE_SECONDS):
+    """Change duration by ``1 / factor`` while keeping the pitch."""
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    wav = np.asarray(wav, dtype=np.float32)
+    frame = 2 * max(1, int(sr * frame_seconds) // 2)
+    hop = frame // 2
+    tolerance = int(sr * tolerance_seconds)
+    if len(wav) < 2 * frame:
+        return resample_speed_up(wav, sr, factor)
+
+    # Periodic Hann windows at 50% overlap sum to one, so no normalisation.
+    window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(frame) / frame)).astype(np.float32)
+    out_len = int(len(wav) / factor)
+    frames = max(1, (out_len - frame) // hop + 1)
+    out = np.zeros(frames * hop + frame, dtype=np.float32)
+    last_start = len(wav) - frame
+
+    pos = 0
+    for k in range(frames):
+        if k:
+            # Pick the input frame near the nominal position that best
+            # continues what was copied last (the "natural" next frame).
+            natural = min(pos + hop, last_start)
+            template = wav[natural:natural + frame]
+            nominal = min(int(k * hop * factor), last_start)
+            lo = max(0, nominal - tolerance)
+            hi = min(last_start, nominal + tolerance)
+            candidates = sliding_window_view(wav[lo:hi + frame], frame)
+            pos = lo + int(np.argmax(candidates @ template))
+        out[k * hop:k * hop + frame] += wav[pos:pos + frame] * window
+    return out[:out_len]
+
+
+def time_stretch(wav, sr, factor, method="resample"):
+    if factor == 1.0:
+        return wav
+    if method == "resample":
+        return resample_speed_up(wav, sr, factor)
+    if method == "wsola":
+        return wsola(wav, sr, factor)
+    raise ValueError(f"Unknown tempo method {method!r}, expected one of {TEMPO_METHODS}")
+
+
+# =============================
+# BENCHMARK
+# =============================
+TEST_TONES = (220.0, 1330.0, 4100.0, 9000.0, 11800.0)
+
+
+def test_signal(sr, seconds):
+    t = np.arange(int(sr * seconds)) / sr
+    return (sum(np.sin(2 * np.pi * f * t) for f in TEST_TONES) / len(TEST_TONES)).astype(np.float32)
+
+
+def speed_up_snr(output, sr, factor):
+    """
+    SNR against the ideal sped-up test signal. Tones pushed above ~0.9x
+    Nyquist should be filtered out, so they are excluded from the reference
+    and anything left of them counts as error (aliasing).
+    """
+    n = np.arange(len(output))
+    keep = [f for f in TEST_TONES if f * factor < 0.45 * sr]
+    reference = sum(np.sin(2 * np.pi * f * factor * n / sr) for f in keep) / len(TEST_TONES)
+    trim = min(len(output), len(reference)) - sr // 10
+    edge = sr // 10
+    error = output[edge:trim] - reference[edge:trim]
+    return float(10 * np.log10(np.sum(reference[edge:trim] ** 2) / np.sum(error ** 2)))
+
+
+def measure_call(fn, *args):
+    """``(result, seconds, peak traced bytes)`` of ``fn(*args)``."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tempo change methods.")
+    parser.add_argument("--input", default=None, help="Episode WAV to stretch (default: synthetic tones).")
+    parser.add_argument("--seconds", type=float, default=600.0, help="Length of the synthetic signal.")
+    parser.add_argument("--sr", type=int, default=24000)
+    parser.add_argument("--factor", type=float, default=1.05)
+    args = parser.parse_args(argv)
+
+    if args.input:
+        import soundfile as sf
+        wav, sr = sf.read(args.input, dtype="float32")
+        synthetic = False
+    else:
+        wav, sr = test_signal(args.sr, args.seconds), args.sr
+        synthetic = True
+    print(f"{len(wav) / sr:.0f}s at {sr} Hz, factor {args.factor}")
+
+    methods = {
+        "decimate": lambda: decimate_speed_up(wav, args.factor),
+        "resample": lambda: resample_speed_up(wav, sr, args.factor),
+        "wsola": lambda: wsola(wav, sr, args.factor),
+    }
+    for name, fn in methods.items():
+        out, elapsed, peak = measure_call(fn)
+        line = (f"{name:<9} {elapsed:7.2f}s  {len(wav) / sr / elapsed:8.0f}x realtime  "
+                f"peak alloc {peak / 1024 ** 2:7.1f} MB  out {len(out) / sr:7.1f}s")
+        # WSOLA keeps the pitch, so the pitch-raised reference does not apply.
+        if synthetic and name != "wsola":
+            line += f"  SNR {speed_up_snr(out, sr, args.factor):5.1f} dB"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
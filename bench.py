@@ -0,0 +1,196 @@
+"""
+End-to-end TTS benchmark over the repo's episode scripts.
+
+Replays PODCAST_SEGMENTS from the pod*.py scripts through the shared
+renderer and records, per segment: wall time, audio seconds, real-time
+factor (audio seconds / compute seconds), chars/sec and the peak RSS
+sampled while the segment renders. Results are summarised by language and
+speaker and written as JSON; ``compare`` flags regressions between two
+result files.
+
+    python bench.py run --output bench/base.json
+    python bench.py run --precision bf16 --output bench/bf16.json
+    python bench.py compare bench/base.json bench/bf16.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from profiling import RssSampler
+from renderer import PRECISIONS, RenderOptions, Renderer, plan_segments
+
+# =============================
+# CONFIG
+# =============================
+SCRIPTS = ("pod", "pod_jp", "pod_nomura_en", "pod_nomura_jp", "pod_nomura_jp1")
+REGRESSION_THRESHOLD = 0.10
+
+# Throughput metrics compared per summary group; higher is better for both.
+METRICS = ("real_time_factor", "chars_per_second")
+
+
+def _rss_mb():
+    import psutil
+    return psutil.Process().memory_info().rss / 1024 ** 2
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(segments):
+    """Totals per group; RTF and chars/sec are ratios of sums, not means."""
+    groups = {}
+    for seg in segments:
+        for key in ("all", f"language:{seg['language']}", f"speaker:{seg['speaker']}"):
+            group = groups.setdefault(key, {"segments": 0, "chars": 0, "audio_seconds": 0.0, "wall_seconds": 0.0})
+            group["segments"] += 1
+            group["chars"] += seg["chars"]
+            group["audio_seconds"] += seg["audio_seconds"]
+            group["wall_seconds"] += seg["wall_seconds"]
+
+    for group in groups.values():
+        group["real_time_factor"] = group["audio_seconds"] / group["wall_seconds"]
+        group["chars_per_second"] = group["chars"] / group["wall_seconds"]
+    return groups
+
+
+def run(scripts, options):
+    renderer = Renderer(options)
+
+    start = time.perf_counter()
+    renderer.model
+    load_seconds = time.perf_counter() - start
+    rss_after_load = _rss_mb()
+
+    segments = []
+    for script in scripts:
+        episode = importlib.import_module(script)
+        jobs = plan_segments(episode.PODCAST_SEGMENTS, episode.VOICES, episode.LANGUAGE)
+
+        # Time each segment individually: one generate call per segment.
+        for job in jobs:
+            start = time.perf_counter()
+            with RssSampler() as rss:
+                for _, wav, sr in renderer.synthesize([job]):
+                    pass
+            wall = time.perf_counter() - start
+            audio = len(wav) / sr
+            segments.append({
+                "script": script,
+                "index": job.index,
+                "role": job.role,
+                "language": job.language,
+                "speaker": job.speaker,
+                "chars": len(job.text),
+                "wall_seconds": wall,
+                "audio_seconds": audio,
+                "real_time_factor": audio / wall,
+                "chars_per_second": len(job.text) / wall,
+                "peak_rss_mb": rss.peak / 1024 ** 2,
+            })
+            print(f"{script}[{job.index}] {job.language}/{job.speaker}: "
+                  f"{audio:.1f}s audio in {wall:.1f}s (RTF {audio / wall:.2f})", file=sys.stderr)
+
+    import torch
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "host": platform.node(),
+            "cpus": os.cpu_count(),
+            "torch_threads": torch.get_num_threads(),
+            "precision": options.precision,
+            "scripts": list(scripts),
+        },
+        "model_load_seconds": load_seconds,
+        "rss_after_load_mb": rss_after_load,
+        "peak_rss_mb": _peak_rss_mb(),
+        "summary": summarize(segments),
+        "segments": segments,
+    }
+
+
+# =============================
+# COMPARE
+# =============================
+def compare(old, new, threshold=REGRESSION_THRESHOLD):
+    """Return human-readable lines; regressions are prefixed with REGRESSION."""
+    lines = []
+    if old["meta"]["scripts"] != new["meta"]["scripts"]:
+        lines.append(f"warning    runs replayed different scripts: {old['meta']['scripts']} vs {new['meta']['scripts']}")
+
+    def check(label, before, after, higher_is_better):
+        change = (after - before) / before if before else 0.0
+        worse = -change if higher_is_better else change
+        flag = "REGRESSION" if worse > threshold else "ok"
+        lines.append(f"{flag:<10} {label:<40} {before:>10.3f} -> {after:>10.3f} ({100 * change:+.1f}%)")
+
+    check("model_load_seconds", old["model_load_seconds"], new["model_load_seconds"], False)
+    check("peak_rss_mb", old["peak_rss_mb"], new["peak_rss_mb"], False)
+    for group in sorted(set(old["summary"]) & set(new["summary"])):
+        for metric in METRICS:
+            check(f"{group} {metric}", old["summary"][group][metric], new["summary"][group][metric], True)
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-segment TTS benchmark.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Replay the episode scripts and record timings.")
+    run_parser.add_argument("--scripts", nargs="+", default=list(SCRIPTS))
+    run_parser.add_argument("--model-path", default=None)
+    run_parser.add_argument("--precision", choices=PRECISIONS, default="fp32")
+    run_parser.add_argument("--output", default="bench_output.json")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions between two runs.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                                help="Relative change that counts as a regression (default 10%%).")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        options = RenderOptions(model_path=args.model_path, precision=args.precision)
+        results = run(args.scripts, options)
+        if os.path.dirname(args.output):
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        total = results["summary"]["all"]
+        print(f"{total['segments']} segments, RTF {total['real_time_factor']:.2f}, "
+              f"{total['chars_per_second']:.1f} chars/s, load {results['model_load_seconds']:.1f}s, "
+              f"peak RSS {results['peak_rss_mb']:.0f} MB -> {args.output}")
+        return 0
+
+    with open(args.baseline) as f:
+        old = json.load(f)
+    with open(args.candidate) as f:
+        new = json.load(f)
+    lines = compare(old, new, args.threshold)
+    print("\n".join(lines))
+    return 1 if any(line.startswith("REGRESSION") for line in lines) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Sentence-level chunking for long segment texts.
+
+A guest closer with four sentences is one long autoregressive decode, and
+that single call sets the latency of the whole segment. Splitting it on
+sentence punctuation (English . ? ! … and Japanese 。？！…, falling back to
+、 and commas for very long sentences) turns it into several short decodes
+that batch together; the pieces are stitched back with a short equal-power
+crossfade so the seams are not audible.
+
+Compare latency and RTF against whole-segment generation with:
+
+    python chunking.py pod_nomura_en pod_nomura_jp1 --batch-size 4
+"""
+import argparse
+import importlib
+import re
+import time
+from dataclasses import replace
+
+import numpy as np
+
+from profiling import segment, span
+
+# =============================
+# CONFIG
+# =============================
+MIN_CHARS = 12
+MAX_CHARS = 220
+CROSSFADE_SECONDS = 0.03
+
+# Split after sentence-final punctuation (plus closing quotes/brackets), and
+# after Latin punctuation only when whitespace follows so "8.5" stays intact.
+SENTENCE_END = re.compile(r"(?<=[。！？!?…])[」』）)\"”’]*|(?<=[.])(?=\s)")
+CLAUSE_END = re.compile(r"(?<=[、，,;；])")
+
+
+def _split(text, pattern):
+    """``(separator, piece)`` pairs: each stripped piece and the whitespace that preceded it."""
+    raw, start = [], 0
+    for match in pattern.finditer(text):
+        end = match.end()
+        if end > start:
+            raw.append(text[start:end])
+            start = end
+    raw.append(text[start:])
+
+    pieces, gap = [], ""
+    for piece in raw:
+        stripped = piece.strip()
+        if not stripped:
+            gap += piece
+            continue
+        pieces.append((gap + piece[:len(piece) - len(piece.lstrip())], stripped))
+        gap = piece[len(piece.rstrip()):]
+    return pieces
+
+
+def split_sentences(text, min_chars=MIN_CHARS, max_chars=MAX_CHARS):
+    """
+    Sentences of ``text`` with punctuation kept; sentences over ``max_chars``
+    are split again at clause commas, and fragments under ``min_chars``
+    (e.g. "はい。") are merged into the next piece with their original spacing.
+    """
+    pieces = []
+    for separator, sentence in _split(text, SENTENCE_END):
+        if len(sentence) > max_chars:
+            clauses = _split(sentence, CLAUSE_END)
+            clauses[0] = (separator, clauses[0][1])
+            pieces.extend(clauses)
+        else:
+            pieces.append((separator, sentence))
+
+    merged = []
+    carry = None
+    for separator, piece in pieces:
+        if carry:
+            separator, piece = carry[0], carry[1] + separator + piece
+        if len(piece) < min_chars:
+            carry = (separator, piece)
+        else:
+            merged.append((separator, piece))
+            carry = None
+    if carry:
+        if merged:
+            merged[-1] = (merged[-1][0], merged[-1][1] + carry[0] + carry[1])
+        else:
+            merged.append(carry)
+    return [piece for _, piece in merged]
+
+
+def crossfade_concat(pieces, sample_rate, crossfade_seconds=CROSSFADE_SECONDS):
+    """Join waveforms with an equal-power crossfade into one float32 buffer."""
+    if len(pieces) == 1:
+        return pieces[0]
+    fade = int(sample_rate * crossfade_seconds)
+    overlaps = [min(fade, len(a), len(b)) for a, b in zip(pieces, pieces[1:])]
+    out = np.zeros(sum(len(piece) for piece in pieces) - sum(overlaps), dtype=np.float32)
+
+    pos = 0
+    for i, piece in enumerate(pieces):
+        piece = np.asarray(piece, dtype=np.float32)
+        head = overlaps[i - 1] if i else 0
+        if head:
+            ramp = np.linspace(0.0, np.pi / 2, head, dtype=np.float32)
+            out[pos:pos + head] *= np.cos(ramp)
+            out[pos:pos + head] += piece[:head] * np.sin(ramp)
+        out[pos + head:pos + len(piece)] = piece[head:]
+        pos += len(piece) - (overlaps[i] if i < len(overlaps) else 0)
+    return out
+
+
+def expand_jobs(jobs, min_chars=MIN_CHARS, max_chars=MAX_CHARS):
+    """Sub-jobs (renumbered 0..n-1) plus, per parent, the sub-job indices."""
+    chunks, groups = [], []
+    for job in jobs:
+        group = []
+        for text in split_sentences(job.text, min_chars, max_chars):
+            group.append(len(chunks))
+            chunks.append(replace(job, index=len(chunks), text=text, pause=0.0))
+        groups.append(group)
+    return chunks, groups
+
+
+def synthesize_split(synthesize, jobs, crossfade_seconds=CROSSFADE_SECONDS):
+    """
+    Wrap a ``synthesize(jobs)`` generator: run sentence chunks through it and
+    yield ``(job, wav, sample_rate)`` per original job, in order.
+    """
+    chunks, groups = expand_jobs(jobs)
+    results = synthesize(chunks)
+    for job, group in zip(jobs, groups):
+        pieces = []
+        sample_rate = None
+        # Sentence chunks are profiled as part of their segment.
+        with segment(job.index):
+            for _ in group:
+                _, wav, sample_rate = next(results)
+                pieces.append(wav)
+        with span("crossfade"):
+            wav = crossfade_concat(pieces, sample_rate, crossfade_seconds)
+        yield job, wav, sample_rate
+
+
+# =============================
+# BENCHMARK
+# =============================
+def main(argv=None):
+    from renderer import RenderOptions, Renderer, load_model, plan_segments
+
+    parser = argparse.ArgumentParser(description="Whole-segment vs sentence-chunked generation.")
+    parser.add_argument("scripts", nargs="*", default=["pod_nomura_en", "pod_nomura_jp1"])
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--model-path", default=None)
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model_path)
+    whole = Renderer(RenderOptions(model_path=args.model_path), model=model)
+    split = Renderer(RenderOptions(model_path=args.model_path, batch_size=args.batch_size,
+                                   split_sentences=True), model=model)
+
+    for script in args.scripts:
+        episode = importlib.import_module(script)
+        jobs = plan_segments(episode.PODCAST_SEGMENTS, episode.VOICES, episode.LANGUAGE)
+        print(f"\n{script}: {len(jobs)} segments -> {len(expand_jobs(jobs)[0])} chunks")
+        print(f"{'seg':>4}{'chars':>7}{'chunks':>8}{'whole s':>9}{'split s':>9}{'whole RTF':>11}{'split RTF':>11}")
+
+        totals = {"whole": [0.0, 0.0], "split": [0.0, 0.0]}
+        for job in jobs:
+            row = []
+            for name, renderer in (("whole", whole), ("split", split)):
+                start = time.perf_counter()
+                _, wav, sr = next(renderer.synthesize([job]))
+                elapsed = time.perf_counter() - start
+                totals[name][0] += elapsed
+                totals[name][1] += len(wav) / sr
+                row += [elapsed, len(wav) / sr / elapsed]
+            print(f"{job.index:>4}{len(job.text):>7}{len(split_sentences(job.text)):>8}"
+                  f"{row[0]:>9.1f}{row[2]:>9.1f}{row[1]:>11.2f}{row[3]:>11.2f}")
+
+        for name, (seconds, audio) in totals.items():
+            print(f"{name}: {seconds:.1f}s for {audio:.1f}s audio, RTF {audio / seconds:.2f}, "
+                  f"mean latency {seconds / len(jobs):.1f}s/segment")
+
+
+if __name__ == "__main__":
+    main()
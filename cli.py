@@ -0,0 +1,183 @@
+"""
+One entry point for the podcast tooling that starts fast.
+
+Nothing heavy is imported until a subcommand needs it: ``cli.py`` itself
+only pulls in the standard library. The renderer loads torch and qwen_tts
+when the model is first used, and matplotlib/moviepy are never on the
+render path. ``imports`` runs each subcommand's startup under
+``python -X importtime`` in a fresh interpreter and breaks the cost down per
+top-level package. Pass ``--budget-ms`` to fail when startup regresses, or
+when a heavy package (``HEAVY``) creeps into it.
+
+    python cli.py render pod_nomura_en --batch-size 4    # any pod*.py flag
+    python cli.py render episodes/pod_jp.yaml             # or an episode spec
+    python cli.py preview pod_nomura_jp1 --segments 3    # first segments, streamed to a growing WAV
+    python cli.py video podcast_output/podcast_jp.wav --style spectrum
+    python cli.py variants pod_nomura_en pod_nomura_jp --batch-size 4   # one model, shared batches
+    python cli.py bench run --output bench/base.json     # bench.py subcommands
+    python cli.py imports --budget-ms 400
+"""
+import argparse
+import importlib
+import os
+import runpy
+import subprocess
+import sys
+
+# =============================
+# CONFIG
+# =============================
+# Modules each subcommand imports before it starts working.
+STARTUP = {
+    "render": ("renderer", "episode_spec"),
+    "preview": ("renderer", "streaming", "episode_spec"),
+    "video": ("visualize",),
+    "bench": ("bench",),
+    "variants": ("variants",),
+}
+HEAVY = ("torch", "qwen_tts", "transformers", "onnxruntime", "matplotlib", "moviepy", "librosa", "scipy")
+PREVIEW_SEGMENTS = 3
+TOP_PACKAGES = 8
+
+
+# =============================
+# SUBCOMMANDS
+# =============================
+def render(script, argv):
+    """Render an episode spec, or run a pod*.py script as if called directly (same output and flags)."""
+    from episode_spec import is_spec, load_spec
+
+    if is_spec(script):
+        from renderer import run_episode
+        spec = load_spec(script)
+        run_episode(spec["segments"], spec["voices"], spec["language"], filename=spec["output"], argv=argv)
+        return 0
+    sys.argv = [f"{script}.py"] + argv
+    runpy.run_module(script, run_name="__main__", alter_sys=True)
+
+
+def preview(script, segments, argv):
+    from episode_spec import load_episode
+    from renderer import run_episode
+
+    spec = load_episode(script)
+    name = os.path.splitext(os.path.basename(script))[0]
+    return run_episode(spec["segments"][:segments], spec["voices"], spec["language"],
+                       filename=f"{name}_preview.wav", argv=["--stream", "file"] + argv)
+
+
+def video(argv):
+    parser = argparse.ArgumentParser(prog="cli.py video", description="Render an episode WAV to an MP4.")
+    parser.add_argument("audio")
+    parser.add_argument("--output", default=None, help="Defaults to the WAV path with .mp4.")
+    parser.add_argument("--style", choices=("waveform", "spectrum"), default="waveform")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--encoder", choices=("ffmpeg", "moviepy"), default="ffmpeg")
+    args = parser.parse_args(argv)
+
+    from visualize import write_video
+    print(f"Podcast video saved to {write_video(args.audio, args.output, args.style, args.fps, encoder=args.encoder)}")
+
+
+# =============================
+# IMPORT-TIME REPORT
+# =============================
+def startup(command):
+    """Import what ``command`` imports before doing any work (measured by ``imports``)."""
+    for module in STARTUP[command]:
+        importlib.import_module(module)
+
+
+def _importtime(code):
+    """``{module: self_ms}`` for every module ``code`` imports in a fresh interpreter."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=here, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(own) / 1000
+    return modules
+
+
+def import_times(command):
+    """
+    ``(total_ms, {package: ms})`` for ``command``'s startup: self time of
+    every module it imports, summed per top-level package (so numpy's cost
+    is numpy's, not its first importer's). What the bare interpreter
+    imports anyway (site, encodings, ...) is left out.
+    """
+    baseline = _importtime("pass")
+    packages = {}
+    for module, ms in _importtime(f"import cli; cli.startup({command!r})").items():
+        if module not in baseline:
+            package = module.split(".")[0]
+            packages[package] = packages.get(package, 0.0) + ms
+    return sum(packages.values()), packages
+
+
+def report_imports(commands, budget_ms=None):
+    """Print the per-command breakdown; returns 1 if a budget or heavy-import check fails."""
+    status = 0
+    for command in commands:
+        total, packages = import_times(command)
+        heavy = sorted(package for package in packages if package in HEAVY)
+        over = budget_ms is not None and total > budget_ms
+        flag = "REGRESSION" if over or heavy else "ok"
+        print(f"{flag:<10} {command:<8} {total:>8.1f} ms startup"
+              + (f" (budget {budget_ms:.0f} ms)" if budget_ms is not None else "")
+              + (f", heavy: {', '.join(heavy)}" if heavy else ""))
+        top = sorted(packages.items(), key=lambda item: -item[1])[:TOP_PACKAGES]
+        for package, ms in top:
+            print(f"{'':<20}{ms:>8.1f} ms  {package}")
+        if flag != "ok":
+            status = 1
+    return status
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(description="Podcast rendering tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render_parser = commands.add_parser("render", help="Render an episode spec or script (pod*.py flags pass through).")
+    render_parser.add_argument("script")
+    preview_parser = commands.add_parser("preview", help="Stream the first segments of an episode to a WAV.")
+    preview_parser.add_argument("script")
+    preview_parser.add_argument("--segments", type=int, default=PREVIEW_SEGMENTS)
+    commands.add_parser("video", help="Waveform/spectrum MP4 of an episode WAV (visualize.py).", add_help=False)
+    commands.add_parser("bench", help="Per-segment benchmark (bench.py run/compare).", add_help=False)
+    commands.add_parser("variants", help="Language variants of an episode on one model (variants.py).",
+                        add_help=False)
+    imports_parser = commands.add_parser("imports", help="Import-time report for each subcommand's startup.")
+    imports_parser.add_argument("commands", nargs="*", metavar="COMMAND",
+                                help=f"Any of {', '.join(STARTUP)} (default: all).")
+    imports_parser.add_argument("--budget-ms", type=float, default=None,
+                                help="Fail (exit 1) if a command's startup imports take longer than this.")
+    args, rest = parser.parse_known_args(argv)
+
+    if args.command == "render":
+        return render(args.script, rest)
+    if args.command == "preview":
+        preview(args.script, args.segments, rest)
+        return 0
+    if args.command == "video":
+        return video(rest)
+    if args.command == "bench":
+        from bench import main as bench_main
+        return bench_main(rest)
+    if args.command == "variants":
+        from variants import main as variants_main
+        return variants_main(rest)
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    unknown = [command for command in args.commands if command not in STARTUP]
+    if unknown:
+        parser.error(f"no startup list for {', '.join(unknown)}")
+    return report_imports(args.commands or list(STARTUP), args.budget_ms)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Optional torch.compile (inductor, CPU) execution path.
+
+``--compile`` compiles the modules that run in the hot loops: the talker
+transformer (once per decode step), the code predictor (once per codebook
+per step) and the codec decoder (once per 300-frame chunk). They are
+compiled in place with ``dynamic=True`` so the growing KV length and
+varying chunk lengths do not trigger a recompile each time.
+
+A deterministic greedy warmup over short, medium and long texts then
+compiles every graph up front. The inductor artifacts (FX graph and
+AOTAutograd caches) persist in ``COMPILE_CACHE_DIR``, so later runs on
+the same host load kernels instead of recompiling them.
+
+Compare eager against compiled (first-run overhead and steady state); run
+it twice to see the cache-warm first run:
+
+    python compiled.py pod_nomura_jp1
+"""
+import argparse
+import importlib
+import logging
+import os
+import time
+
+import numpy as np
+
+logger = logging.getLogger("compiled")
+
+# =============================
+# CONFIG
+# =============================
+COMPILE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "qwen3tts", "inductor")
+WARMUP_SPEAKER = "Ryan"
+WARMUP_TEXTS = (
+    ("English", "Welcome back to the show."),
+    ("English", "This paper introduced the Transformer architecture, an approach that removed "
+                "recurrence and convolutions entirely and relied purely on attention mechanisms."),
+    ("Japanese", "みなさん、こんにちは。ポッドキャストへようこそ。今回は『ノムラレポート2025』を取り上げます。"
+                 "100年の歴史だけでなく、これからの10年をどうえがいているのかが詰まっている内容です。"
+                 "本日は、長年ノムラを知り尽くしている渡辺健司さんをお迎えしています。"),
+)
+
+
+def configure_cache(cache_dir=COMPILE_CACHE_DIR):
+    """Point inductor's on-disk caches at ``cache_dir`` (kept between runs)."""
+    os.makedirs(cache_dir, exist_ok=True)
+    os.environ["TORCHINDUCTOR_CACHE_DIR"] = cache_dir
+    os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+    os.environ.setdefault("TORCHINDUCTOR_AUTOGRAD_CACHE", "1")
+    import torch._inductor.config as inductor_config
+    inductor_config.fx_graph_cache = True
+    return cache_dir
+
+
+def compile_targets(model):
+    talker = model.model.talker
+    targets = {"talker": talker.model, "code_predictor": talker.code_predictor.model}
+    # A decoder already running on onnxruntime (onnx_backend.py) has nothing left to compile.
+    if getattr(model, "_onnx_codec", None) is None:
+        targets["codec"] = model.model.speech_tokenizer.model.decoder
+    return targets
+
+
+def warm_up(model, texts=WARMUP_TEXTS, speaker=WARMUP_SPEAKER):
+    """Greedy, seeded generation over ``texts`` so every graph is built before real work."""
+    import torch
+
+    from renderer import GREEDY
+
+    start = time.perf_counter()
+    for language, text in texts:
+        torch.manual_seed(0)
+        model.generate_custom_voice(text=text, speaker=speaker, language=language, **GREEDY)
+    return time.perf_counter() - start
+
+
+def compile_model(model, cache_dir=COMPILE_CACHE_DIR, warmup=True):
+    """Compile ``model``'s hot modules in place (once) and warm them up."""
+    if getattr(model, "_compiled", False):
+        return model
+    cache_dir = configure_cache(cache_dir)
+    cold = not os.listdir(cache_dir)
+    for module in compile_targets(model).values():
+        module.compile(backend="inductor", dynamic=True)
+    model._compiled = True
+    if warmup:
+        seconds = warm_up(model)
+        logger.info("Compiled %s and warmed up in %.1fs (%s cache at %s)",
+                    ", ".join(compile_targets(model)), seconds, "cold" if cold else "warm", cache_dir)
+    return model
+
+
+# =============================
+# BENCHMARK
+# =============================
+def _run(model, jobs):
+    import torch
+
+    from renderer import GREEDY
+
+    seconds, wavs = [], []
+    for job in jobs:
+        torch.manual_seed(0)
+        start = time.perf_counter()
+        out, _ = model.generate_custom_voice(
+            text=job.text, language=job.language, speaker=job.speaker, instruct=job.instruct, **GREEDY,
+        )
+        seconds.append(time.perf_counter() - start)
+        wavs.append(out[0])
+    return seconds, wavs
+
+
+def main(argv=None):
+    from renderer import PRECISIONS, load_model, plan_segments
+
+    parser = argparse.ArgumentParser(description="Eager vs torch.compile (inductor) on CPU.")
+    parser.add_argument("script", nargs="?", default="pod_nomura_jp1")
+    parser.add_argument("--segments", type=int, default=6, help="How many segments of the script to time.")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--precision", choices=PRECISIONS, default="fp32")
+    parser.add_argument("--cache-dir", default=COMPILE_CACHE_DIR)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    episode = importlib.import_module(args.script)
+    jobs = plan_segments(episode.PODCAST_SEGMENTS, episode.VOICES, episode.LANGUAGE)[:args.segments]
+    model = load_model(args.model_path, precision=args.precision)
+
+    warm_up(model)  # first-call allocations, so eager is timed warm too
+    eager_warmup = warm_up(model)
+    eager, eager_wavs = _run(model, jobs)
+
+    start = time.perf_counter()
+    compile_model(model, args.cache_dir, warmup=False)
+    warm_up(model)
+    compile_seconds = time.perf_counter() - start
+    compiled, compiled_wavs = _run(model, jobs)
+
+    print(f"\n{args.script}, {len(jobs)} segments, {args.precision}")
+    print(f"first run over the {len(WARMUP_TEXTS)} warmup texts: {compile_seconds:.1f}s compiled vs "
+          f"{eager_warmup:.1f}s eager (overhead {compile_seconds - eager_warmup:.1f}s)")
+    print(f"{'seg':>4}{'chars':>7}{'eager s':>9}{'compiled s':>12}{'speedup':>9}{'max |diff|':>12}")
+    for job, e, c, a, b in zip(jobs, eager, compiled, eager_wavs, compiled_wavs):
+        diff = f"{np.max(np.abs(a - b)):.2e}" if len(a) == len(b) else f"len {len(a)}/{len(b)}"
+        print(f"{job.index:>4}{len(job.text):>7}{e:>9.2f}{c:>12.2f}{e / c:>8.2f}x{diff:>12}")
+    saved = (sum(eager) - sum(compiled)) / len(jobs)
+    print(f"steady state: {sum(eager):.1f}s eager, {sum(compiled):.1f}s compiled "
+          f"({sum(eager) / sum(compiled):.2f}x)")
+    if saved > 0:
+        print(f"compiling pays for itself after ~{(compile_seconds - eager_warmup) / saved:.0f} segments")
+
+
+if __name__ == "__main__":
+    main()
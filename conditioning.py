@@ -0,0 +1,231 @@
+"""
+Conditioning cache: stop re-encoding the same voice prompt for every segment.
+
+An episode calls generate_custom_voice with two speakers and their two
+instruct strings for every segment, and qwen_tts rebuilds the prompt from
+scratch each time: the instruct is re-tokenized and pushed through the
+talker's text embedding and ``text_projection`` MLP, and so are the
+constant role tokens (``<|im_start|>assistant\\n``) and tts bos/eos/pad.
+``ConditioningCache`` hooks into a loaded model and keeps those results:
+
+- tokenized prompts are memoised per string (LRU, ``MAX_TEXTS``),
+- embedding + projection of a whole memoised prompt (the instruct) and of
+  the constant prefix tokens are computed once and reused.
+
+Speaker and language only pick rows of the codec embedding table, so there
+is nothing to precompute for them and entries are keyed by the instruct
+text alone.
+
+A KV cache of the shared prefix cannot be reused through qwen_tts 0.0.5:
+talker.generate takes a left-padded batch of inputs_embeds and no
+past_key_values.
+
+Outputs are bit-identical with and without the cache. Per-segment speedup:
+
+    python conditioning.py pod_nomura_jp1
+"""
+import argparse
+import importlib
+import logging
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger("conditioning")
+
+# =============================
+# CONFIG
+# =============================
+MAX_TEXTS = 4096
+ROLE_PREFIX = "<|im_start|>assistant\n"
+ROLE_TOKENS = 3
+
+
+class ConditioningCache:
+    """Install with ``ConditioningCache.install(model)``; ``uninstall`` restores the model."""
+
+    def __init__(self, model, max_texts=MAX_TEXTS):
+        self.model = model
+        self.enabled = True
+        self.max_texts = max_texts
+        self.talker = model.model.talker
+        self.texts = OrderedDict()  # prompt string -> token ids
+        self.prefixes = {}          # prompt string or constant token tuple -> [ids, embedding, projection]
+        self._by_ids = {}           # id(ids) -> prefix key, for whole memoised prompts
+        self._by_embedding = {}     # id(embedding) -> prefix key
+        self.stats = {"token_hits": 0, "token_misses": 0, "prefix_hits": 0, "prefix_misses": 0,
+                      "saved_seconds": 0.0}
+        self._costs = {}
+
+        self._tokenize = model._tokenize_texts
+        self._embedding = self.talker.get_text_embeddings()
+        self._projection = self.talker.text_projection.forward
+
+        config = model.model.config
+        role = tuple(self._tokenize([ROLE_PREFIX])[0].flatten().tolist()[:ROLE_TOKENS])
+        special = (config.tts_bos_token_id, config.tts_eos_token_id, config.tts_pad_token_id)
+        self._constants = {role, special}
+        self._constant_sizes = {len(key) for key in self._constants}
+
+        model._tokenize_texts = self.tokenize_texts
+        self.talker.get_text_embeddings = lambda: self.embed
+        self.talker.text_projection.forward = self.project
+        model._conditioning_cache = self
+
+    @classmethod
+    def install(cls, model, max_texts=MAX_TEXTS):
+        """Hook ``model`` once; returns None if this qwen_tts build lacks the hooks."""
+        existing = getattr(model, "_conditioning_cache", None)
+        if existing is not None:
+            return existing
+        try:
+            return cls(model, max_texts)
+        except AttributeError as exc:
+            logger.warning("Conditioning cache disabled: %s", exc)
+            return None
+
+    def uninstall(self):
+        del self.model._tokenize_texts
+        del self.talker.get_text_embeddings
+        del self.talker.text_projection.forward
+        del self.model._conditioning_cache
+
+    def prime(self, texts, ids):
+        """Store token ids computed elsewhere (frontend.pretokenize)."""
+        for text, row in zip(texts, ids):
+            self._remember(text, row)
+
+    def clear(self):
+        self.texts.clear()
+        self.prefixes.clear()
+        self._by_ids.clear()
+        self._by_embedding.clear()
+
+    # ---- hooks ----
+    def tokenize_texts(self, texts):
+        if not self.enabled:
+            return self._tokenize(texts)
+        out = []
+        misses = [text for text in dict.fromkeys(texts) if text not in self.texts]
+        if misses:
+            start = time.perf_counter()
+            for text, ids in zip(misses, self._tokenize(misses)):
+                self._remember(text, ids)
+            self._costs["tokenize"] = (time.perf_counter() - start) / len(misses)
+        for text in texts:
+            ids = self.texts[text]
+            self.texts.move_to_end(text)
+            out.append(ids)
+        hits = len(texts) - len(misses)
+        self.stats["token_misses"] += len(misses)
+        self.stats["token_hits"] += hits
+        self.stats["saved_seconds"] += hits * self._costs.get("tokenize", 0.0)
+        return out
+
+    def _remember(self, text, ids):
+        self.texts[text] = ids
+        self._by_ids[id(ids)] = text
+        while len(self.texts) > self.max_texts:
+            old_text, old_ids = self.texts.popitem(last=False)
+            self._by_ids.pop(id(old_ids), None)
+            entry = self.prefixes.pop(old_text, None)
+            if entry is not None:
+                self._by_embedding.pop(id(entry[1]), None)
+
+    def _prefix_key(self, ids):
+        key = self._by_ids.get(id(ids))
+        if key is not None and self.texts.get(key) is ids:
+            return key
+        if ids.numel() in self._constant_sizes:
+            key = tuple(ids.flatten().tolist())
+            if key in self._constants:
+                return key
+        return None
+
+    def embed(self, ids):
+        key = self._prefix_key(ids) if self.enabled else None
+        if key is None:
+            return self._embedding(ids)
+        entry = self.prefixes.get(key)
+        if entry is None:
+            entry = self.prefixes[key] = [ids, self._embedding(ids), None]
+            self._by_embedding[id(entry[1])] = key
+        return entry[1]
+
+    def project(self, hidden):
+        key = self._by_embedding.get(id(hidden))
+        entry = self.prefixes.get(key) if key is not None else None
+        if entry is None or entry[1] is not hidden:
+            return self._projection(hidden)
+        if entry[2] is None:
+            start = time.perf_counter()
+            entry[2] = self._projection(hidden)
+            self._costs[key] = time.perf_counter() - start
+            self.stats["prefix_misses"] += 1
+        else:
+            self.stats["prefix_hits"] += 1
+            self.stats["saved_seconds"] += self._costs.get(key, 0.0)
+        return entry[2]
+
+    def log_stats(self):
+        stats = self.stats
+        logger.info(
+            "Conditioning cache: %d/%d prompt tokenizations and %d/%d prefix projections reused, ~%.3fs saved",
+            stats["token_hits"], stats["token_hits"] + stats["token_misses"],
+            stats["prefix_hits"], stats["prefix_hits"] + stats["prefix_misses"],
+            stats["saved_seconds"],
+        )
+
+
+# =============================
+# BENCHMARK
+# =============================
+def _generate(model, job):
+    from renderer import GREEDY
+
+    start = time.perf_counter()
+    wavs, sr = model.generate_custom_voice(
+        text=job.text, language=job.language, speaker=job.speaker, instruct=job.instruct, **GREEDY,
+    )
+    return wavs[0], time.perf_counter() - start
+
+
+def main(argv=None):
+    from renderer import load_model, plan_segments
+
+    parser = argparse.ArgumentParser(description="Per-segment speedup from the conditioning cache.")
+    parser.add_argument("scripts", nargs="*", default=["pod_nomura_jp1"])
+    parser.add_argument("--model-path", default=None)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    model = load_model(args.model_path)
+    cache = ConditioningCache.install(model)
+    if cache is None:
+        return
+
+    for script in args.scripts:
+        episode = importlib.import_module(script)
+        jobs = plan_segments(episode.PODCAST_SEGMENTS, episode.VOICES, episode.LANGUAGE)
+        print(f"\n{script}")
+        print(f"{'seg':>4}{'speaker':>12}{'chars':>7}{'plain s':>9}{'cached s':>10}{'speedup':>9}  identical")
+
+        cache.enabled = False
+        _generate(model, jobs[0])  # warm up allocators before timing anything
+        totals = [0.0, 0.0]
+        for job in jobs:
+            cache.enabled = False
+            plain, plain_seconds = _generate(model, job)
+            cache.enabled = True
+            cached, cached_seconds = _generate(model, job)
+            totals[0] += plain_seconds
+            totals[1] += cached_seconds
+            print(f"{job.index:>4}{job.speaker:>12}{len(job.text):>7}{plain_seconds:>9.2f}{cached_seconds:>10.2f}"
+                  f"{plain_seconds / cached_seconds:>8.2f}x  {np.array_equal(plain, cached)}")
+        print(f"total: {totals[0]:.1f}s plain, {totals[1]:.1f}s cached ({totals[0] / totals[1]:.2f}x)")
+    cache.log_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Declarative episode specs (YAML or JSON) and precompiled render plans.
+
+An episode is data, not code. The layout mirrors the old script literals:
+
+    language: Japanese
+    output: podcast_jp.wav
+    voices:
+      host: {speaker: Ono_Anna, instruct: "...", pause: 0.3}
+      guest: {speaker: Uncle_Fu, instruct: "..."}
+    segments:
+      - role: host
+        text: "..."
+        instruct: "..."   # optional per segment, as are pause and language
+
+``load_spec`` validates the whole file up front and reports every problem
+with its location, not just the first. ``compile_plan`` turns a spec into a
+RenderPlan under given render options. It resolves voices and pauses,
+normalizes the text, sorts the segments into length-sorted batches,
+computes every segment cache key and estimates the duration. ``load_plan``
+keeps the plan next to the spec (``.plan.json``), keyed on the spec bytes
+and the options, so a render or a bulk schedule only reads JSON. Nothing
+imports a Python script.
+
+    python episode_spec.py plan episodes/*.yaml --batch-size 4
+    python episode_spec.py export pod_nomura_en --output podcast_nomura_en.wav > episodes/new.yaml
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+# =============================
+# CONFIG
+# =============================
+SPEC_SUFFIXES = (".yaml", ".yml", ".json")
+PLAN_SUFFIX = ".plan.json"
+PLAN_VERSION = 2
+# Rough speaking rates of the CustomVoice speakers, for duration estimates only.
+CHARS_PER_SECOND = {"english": 14.0, "japanese": 7.0}
+DEFAULT_CHARS_PER_SECOND = 12.0
+
+SPEC_KEYS = {"language": str, "voices": dict, "segments": list, "output": str, "title": str}
+VOICE_KEYS = {"speaker": str, "instruct": str, "pause": (int, float)}
+SEGMENT_KEYS = {"role": str, "text": str, "instruct": str, "pause": (int, float), "language": str}
+REQUIRED = {"spec": ("language", "voices", "segments"), "voice": ("speaker",), "segment": ("role", "text")}
+
+
+class SpecError(ValueError):
+    def __init__(self, source, problems):
+        self.problems = problems
+        super().__init__(f"{source}: {len(problems)} problem(s)\n" + "\n".join(f"  - {p}" for p in problems))
+
+
+def is_spec(path):
+    return path.endswith(SPEC_SUFFIXES)
+
+
+# =============================
+# LOAD + VALIDATE
+# =============================
+def read_spec(path):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        import yaml
+        return yaml.safe_load(f)
+
+
+def _check(problems, where, mapping, keys, required):
+    if not isinstance(mapping, dict):
+        problems.append(f"{where}: expected a mapping, got {type(mapping).__name__}")
+        return False
+    for key in required:
+        if key not in mapping:
+            problems.append(f"{where}: missing {key!r}")
+    for key, value in mapping.items():
+        if key not in keys:
+            problems.append(f"{where}: unknown key {key!r} (expected one of {', '.join(keys)})")
+        elif not isinstance(value, keys[key]) or isinstance(value, bool):
+            problems.append(f"{where}.{key}: expected {getattr(keys[key], '__name__', 'number')}, "
+                            f"got {type(value).__name__}")
+        elif key == "pause" and value < 0:
+            problems.append(f"{where}.pause: must be >= 0, got {value}")
+        elif isinstance(value, str) and not value.strip() and key in ("text", "speaker", "language"):
+            problems.append(f"{where}.{key}: empty")
+    return True
+
+
+def validate(spec, source="spec"):
+    """Raise SpecError listing every problem in ``spec``; returns it with defaults filled in."""
+    problems = []
+    if _check(problems, "spec", spec, SPEC_KEYS, REQUIRED["spec"]):
+        voices = spec.get("voices")
+        if isinstance(voices, dict):
+            if not voices:
+                problems.append("voices: no roles defined")
+            for role, voice in voices.items():
+                _check(problems, f"voices.{role}", voice, VOICE_KEYS, REQUIRED["voice"])
+        segments = spec.get("segments")
+        if isinstance(segments, list):
+            if not segments:
+                problems.append("segments: empty")
+            for index, segment in enumerate(segments):
+                where = f"segments[{index}]"
+                if _check(problems, where, segment, SEGMENT_KEYS, REQUIRED["segment"]) \
+                        and isinstance(voices, dict) and isinstance(segment.get("role"), str) \
+                        and segment["role"] not in voices:
+                    problems.append(f"{where}.role: {segment['role']!r} has no voice (have {', '.join(voices)})")
+    if problems:
+        raise SpecError(source, problems)
+    spec.setdefault("output", os.path.splitext(os.path.basename(source))[0] + ".wav")
+    return spec
+
+
+def load_spec(path):
+    return validate(read_spec(path), path)
+
+
+def load_episode(source):
+    """A spec from a spec file, or from a pod*.py module name (its SPEC, or LANGUAGE/VOICES/PODCAST_SEGMENTS)."""
+    if is_spec(source):
+        return load_spec(source)
+    episode = importlib.import_module(source)
+    if hasattr(episode, "SPEC"):
+        return episode.SPEC
+    return validate({"language": episode.LANGUAGE, "voices": episode.VOICES,
+                     "segments": episode.PODCAST_SEGMENTS}, source)
+
+
+def dump_spec(spec, file=sys.stdout):
+    """Write ``spec`` as YAML, long strings folded so the transcript stays readable."""
+    import yaml
+
+    class Dumper(yaml.SafeDumper):
+        pass
+
+    def string(dumper, value):
+        style = ">" if len(value) > 80 else None
+        return dumper.represent_scalar("tag:yaml.org,2002:str", value, style=style)
+
+    Dumper.add_representer(str, string)
+    yaml.dump(spec, file, Dumper=Dumper, allow_unicode=True, sort_keys=False, width=100)
+
+
+# =============================
+# RENDER PLAN
+# =============================
+@dataclass
+class RenderPlan:
+    name: str
+    output: str
+    jobs: list               # SegmentJobs in script order, normalized, pauses resolved
+    batches: list            # job indices per generate call, length-sorted
+    keys: dict               # job index -> segment cache key
+    fingerprint: str         # model + precision + backend the keys were computed for
+    sampling: dict
+    estimated_seconds: float
+    digest: str = ""         # spec bytes + options this plan is valid for
+
+    def to_dict(self):
+        data = asdict(self)
+        data["version"] = PLAN_VERSION
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        from renderer import SegmentJob
+
+        data = dict(data)
+        data.pop("version", None)
+        data["jobs"] = [SegmentJob(**job) for job in data["jobs"]]
+        data["keys"] = {int(index): key for index, key in data["keys"].items()}
+        return cls(**data)
+
+
+def speech_seconds(job):
+    """Rough spoken length of one job from its language's speaking rate."""
+    return len(job.text) / CHARS_PER_SECOND.get(job.language.lower(), DEFAULT_CHARS_PER_SECOND)
+
+
+def estimate_seconds(jobs, tempo=1.0):
+    """Speech from per-language speaking rates, plus every pause."""
+    return sum(speech_seconds(job) for job in jobs) / tempo + sum(job.pause for job in jobs)
+
+
+def compile_plan(spec, options=None, name="episode"):
+    """Everything a render needs that does not need the model."""
+    from frontend import normalize_jobs
+    from renderer import RenderOptions, plan_batches, plan_segments, segment_fingerprint
+    from segment_cache import SegmentCache
+
+    options = options or RenderOptions()
+    jobs = plan_segments(spec["segments"], spec["voices"], spec["language"])
+    if options.normalize:
+        jobs = normalize_jobs(jobs)
+    fingerprint = segment_fingerprint(options)
+    return RenderPlan(
+        name=name,
+        output=spec["output"],
+        jobs=jobs,
+        batches=[[job.index for job in batch] for batch in plan_batches(jobs, max(1, options.batch_size))],
+        keys={job.index: SegmentCache.key(job, fingerprint, options.sampling) for job in jobs},
+        fingerprint=fingerprint,
+        sampling=dict(options.sampling),
+        estimated_seconds=estimate_seconds(jobs, options.tempo),
+    )
+
+
+def plan_digest(spec_bytes, options):
+    from renderer import segment_fingerprint
+
+    basis = {
+        "version": PLAN_VERSION,
+        "fingerprint": segment_fingerprint(options),
+        "sampling": options.sampling,
+        "batch_size": options.batch_size,
+        "normalize": options.normalize,
+        "tempo": options.tempo,
+    }
+    digest = hashlib.sha256(spec_bytes)
+    digest.update(json.dumps(basis, sort_keys=True).encode())
+    return digest.hexdigest()[:32]
+
+
+def plan_path(path):
+    return os.path.splitext(path)[0] + PLAN_SUFFIX
+
+
+def load_plan(path, options=None, write=True):
+    """The plan for spec ``path`` under ``options``: read from ``.plan.json`` if current, else compiled."""
+    from renderer import RenderOptions
+
+    options = options or RenderOptions()
+    with open(path, "rb") as f:
+        digest = plan_digest(f.read(), options)
+    cached = plan_path(path)
+    if os.path.exists(cached):
+        with open(cached, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("digest") == digest and data.get("version") == PLAN_VERSION:
+            return RenderPlan.from_dict(data)
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    plan = compile_plan(load_spec(path), options, name)
+    plan.digest = digest
+    if write:
+        tmp = f"{cached}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(plan.to_dict(), f, ensure_ascii=False, indent=1)
+        os.replace(tmp, cached)
+    return plan
+
+
+# =============================
+# COMMAND LINE
+# =============================
+def main(argv=None):
+    from renderer import RenderOptions
+
+    parser = argparse.ArgumentParser(description="Validate episode specs and compile their render plans.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    plan_parser = commands.add_parser("plan", help="Validate, compile (or reuse) and summarise render plans.")
+    plan_parser.add_argument("specs", nargs="+")
+    plan_parser.add_argument("--model-path", default=None)
+    plan_parser.add_argument("--batch-size", type=int, default=1)
+    plan_parser.add_argument("--cache-dir", default=None, help="Also count segments already in this segment cache.")
+    export_parser = commands.add_parser("export", help="Print a pod*.py script's episode as a YAML spec.")
+    export_parser.add_argument("script")
+    export_parser.add_argument("--output", default=None, help="Episode filename (defaults to <script>.wav).")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        spec = load_episode(args.script)
+        dump_spec(dict(spec, output=args.output or spec["output"]))
+        return 0
+
+    options = RenderOptions(model_path=args.model_path, batch_size=args.batch_size)
+    cache = None
+    if args.cache_dir:
+        from segment_cache import SegmentCache
+        cache = SegmentCache(args.cache_dir)
+
+    failed = 0
+    print(f"{'spec':<28}{'segments':>9}{'batches':>8}{'est. min':>9}{'cached':>8}{'plan ms':>9}")
+    for path in args.specs:
+        start = time.perf_counter()
+        try:
+            plan = load_plan(path, options)
+        except SpecError as exc:
+            print(exc, file=sys.stderr)
+            failed += 1
+            continue
+        seconds = time.perf_counter() - start
+        cached = sum(key in cache for key in plan.keys.values()) if cache else "-"
+        print(f"{plan.name:<28}{len(plan.jobs):>9}{len(plan.batches):>8}{plan.estimated_seconds / 60:>9.1f}"
+              f"{cached:>8}{1000 * seconds:>9.1f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Text front-end: normalize segment text and tokenize it before generation.
+
+The scripts hand raw strings with em-dashes, ellipses, curly quotes,
+full-width slashes and symbols such as "ROE 8から10%" or "FY2024/25"
+straight to generate_custom_voice, which tokenizes every prompt inside each
+call. This stage runs first instead:
+
+- ``normalize_text`` rewrites punctuation and number formats per language
+  into what the model reads naturally (memoised per string),
+- ``pretokenize`` batch-encodes every prompt of the run with the fast
+  tokenizer in one call and primes the model's conditioning cache, so
+  generate_custom_voice only looks the token ids up.
+
+Show what changes and profile both steps on their own:
+
+    python frontend.py pod_nomura_en pod_nomura_jp1
+    python frontend.py pod_nomura_jp1 --tokenize
+"""
+import argparse
+import importlib
+import logging
+import re
+import time
+from dataclasses import replace
+from functools import lru_cache
+
+logger = logging.getLogger("frontend")
+
+# =============================
+# CONFIG
+# =============================
+MEMO_SIZE = 8192
+
+CHARACTERS = str.maketrans({
+    "’": "'", "‘": "'", "“": '"', "”": '"',
+    "％": "%", "＆": "&", "\u00a0": " ", "\u3000": " ",
+    **{chr(ord("０") + i): str(i) for i in range(10)},
+})
+
+NUMBER = r"\d+(?:\.\d+)?"
+SENTENCE_START = re.compile(r"(?:^|[.!?…][\"'”’)]*)\s*$")
+
+
+def sentence_case(template):
+    """A replacement that expands ``template`` and capitalizes it when the match starts a sentence."""
+    def expand(match):
+        text = match.expand(template)
+        if SENTENCE_START.search(match.string, 0, match.start()):
+            text = text[:1].upper() + text[1:]
+        return text
+    return expand
+
+RULES = {
+    "english": [
+        (re.compile(r"(?<![A-Za-z])FY\s?(\d{2})(\d{2})\s?/\s?(\d{2})\b"), sentence_case(r"fiscal year \1\2 to \1\3")),
+        (re.compile(r"(?<![A-Za-z])FY\s?(\d{4})\b"), sentence_case(r"fiscal year \1")),
+        (re.compile(rf"({NUMBER})\s?[-–〜～~]\s?({NUMBER})\s?%"), r"\1 to \2 percent"),
+        (re.compile(rf"({NUMBER})\s?%"), r"\1 percent"),
+        (re.compile(r"\s*[—–]+\s*"), ", "),
+        (re.compile(r"…"), "..."),
+        (re.compile(r",\s*([,.?!])"), r"\1"),
+    ],
+    "japanese": [
+        (re.compile(r"(?<![A-Za-z])FY\s?(\d{4})\s?/\s?\d{2}(?!\d)"), r"\1年度"),
+        (re.compile(r"(?<![A-Za-z])FY\s?(\d{4})(?!\d)"), r"\1年度"),
+        (re.compile(rf"({NUMBER})\s?[-–〜～~]\s?({NUMBER})"), r"\1から\2"),
+        (re.compile(r"[〜～]"), "から"),
+        (re.compile(rf"({NUMBER})\s?%"), r"\1パーセント"),
+        (re.compile(r"\s*[—–―]+\s*"), "、"),
+        (re.compile(r"\.{3,}|…+"), "…"),
+        (re.compile(r"(?<!\d)[/／](?!\d)"), "・"),
+        (re.compile(r"、\s*([、。？！])"), r"\1"),
+    ],
+}
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def normalize_text(text, language=None):
+    text = text.translate(CHARACTERS)
+    for pattern, replacement in RULES.get((language or "").lower(), ()):
+        text = pattern.sub(replacement, text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def normalize_jobs(jobs):
+    """Copies of ``jobs`` with normalized text (same index, pause and voice)."""
+    return [replace(job, text=normalize_text(job.text, job.language)) for job in jobs]
+
+
+# =============================
+# TOKENIZATION
+# =============================
+def prompt_texts(model, jobs):
+    """The exact strings generate_custom_voice tokenizes for ``jobs``."""
+    texts = [model._build_assistant_text(job.text) for job in jobs]
+    texts += [model._build_instruct_text(job.instruct) for job in jobs if job.instruct]
+    return list(dict.fromkeys(texts))
+
+
+def pretokenize(model, jobs):
+    """
+    Tokenize every prompt of ``jobs`` in one fast-tokenizer batch and store
+    the ids in the model's ConditioningCache. Returns the number of new prompts.
+    """
+    cache = getattr(model, "_conditioning_cache", None)
+    if cache is None or not jobs:
+        return 0
+    import torch
+
+    texts = [text for text in prompt_texts(model, jobs) if text not in cache.texts]
+    if not texts:
+        return 0
+
+    start = time.perf_counter()
+    encoded = model.processor.tokenizer(texts, padding=False)["input_ids"]
+    ids = [torch.tensor([row], dtype=torch.long, device=model.device) for row in encoded]
+    # Only trust the batch path if it matches what the model itself produces.
+    reference = model.processor(text=texts[0], return_tensors="pt", padding=True)["input_ids"]
+    if not torch.equal(ids[0], reference.to(model.device)):
+        logger.warning("Batch tokenization differs from the processor; not pre-tokenizing")
+        return 0
+    cache.prime(texts, ids)
+    logger.info("Pre-tokenized %d prompts in %.3fs", len(texts), time.perf_counter() - start)
+    return len(texts)
+
+
+# =============================
+# PROFILE
+# =============================
+def main(argv=None):
+    from renderer import load_model, plan_segments
+
+    parser = argparse.ArgumentParser(description="Show and profile text normalization and tokenization.")
+    parser.add_argument("scripts", nargs="*", default=["pod", "pod_jp", "pod_nomura_en", "pod_nomura_jp1"])
+    parser.add_argument("--tokenize", action="store_true",
+                        help="Also load the model and time batch vs per-call tokenization.")
+    parser.add_argument("--model-path", default=None)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    jobs = []
+    for script in args.scripts:
+        episode = importlib.import_module(script)
+        for job in plan_segments(episode.PODCAST_SEGMENTS, episode.VOICES, episode.LANGUAGE):
+            jobs.append(job)
+            normalized = normalize_text(job.text, job.language)
+            if normalized != job.text:
+                print(f"{script}[{job.index}]\n  - {job.text}\n  + {normalized}")
+
+    normalize_text.cache_clear()
+    start = time.perf_counter()
+    normalized = normalize_jobs(jobs)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    normalize_jobs(jobs)
+    warm = time.perf_counter() - start
+    print(f"\nnormalize {len(jobs)} segments: {1000 * cold:.2f} ms cold, {1000 * warm:.2f} ms memoised")
+
+    if not args.tokenize:
+        return
+    model = load_model(args.model_path)
+    texts = prompt_texts(model, normalized)
+
+    start = time.perf_counter()
+    for text in texts:
+        model.processor(text=text, return_tensors="pt", padding=True)
+    per_call = time.perf_counter() - start
+
+    model._conditioning_cache.clear()
+    start = time.perf_counter()
+    pretokenize(model, normalized)
+    batched = time.perf_counter() - start
+    print(f"tokenize {len(texts)} prompts: {1000 * per_call:.1f} ms one call each, "
+          f"{1000 * batched:.1f} ms batched up front")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Incremental re-render: only regenerate the segments an edit touched.
+
+Every incremental render writes ``<output>.manifest.json`` next to the
+episode with, per segment, its content hash, sample offset, length, pause
+and how long it took to generate. The next run hashes the new segment list,
+diffs it against the manifest (so inserted, deleted and edited lines are
+all handled), regenerates only what changed and splices the untouched
+audio straight out of the previous file.
+
+    python pod_nomura_jp.py --incremental
+"""
+import difflib
+import hashlib
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import soundfile as sf
+
+from assembly import pause_samples
+
+logger = logging.getLogger("manifest")
+
+# =============================
+# CONFIG
+# =============================
+MANIFEST_SUFFIX = ".manifest.json"
+COPY_BLOCK_FRAMES = 1 << 20
+
+
+def manifest_path(output_path):
+    return output_path + MANIFEST_SUFFIX
+
+
+def segment_hashes(renderer, jobs):
+    """Segment-cache key plus the post-processing that changes the audio."""
+    options = renderer.options
+    post = f"{options.tempo}:{options.tempo_method}:{options.split_sentences}:{options.normalize}"
+    return {
+        index: hashlib.sha256(f"{key}:{post}".encode()).hexdigest()[:32]
+        for index, key in renderer.segment_keys(jobs).items()
+    }
+
+
+def load_manifest(output_path):
+    path = manifest_path(output_path)
+    if not (os.path.exists(path) and os.path.exists(output_path)):
+        return None
+    with open(path) as f:
+        manifest = json.load(f)
+    # A manifest for a file that was since overwritten some other way is useless.
+    if sf.info(output_path).frames != manifest["frames"]:
+        logger.warning("%s does not match its manifest; doing a full render", output_path)
+        return None
+    return manifest
+
+
+def plan_reuse(old_segments, new_hashes):
+    """Map new segment position -> old manifest entry for every unchanged segment."""
+    matcher = difflib.SequenceMatcher(
+        a=[seg["hash"] for seg in old_segments], b=new_hashes, autojunk=False,
+    )
+    reuse = {}
+    for tag, i1, i2, j1, _ in matcher.get_opcodes():
+        if tag == "equal":
+            for k in range(i2 - i1):
+                reuse[j1 + k] = old_segments[i1 + k]
+    return reuse
+
+
+def _timed(iterator):
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        yield item, time.perf_counter() - start
+
+
+def render_incremental(renderer, jobs, output_path):
+    hashes = segment_hashes(renderer, jobs)
+    old = load_manifest(output_path)
+    reuse = plan_reuse(old["segments"], [hashes[job.index] for job in jobs]) if old else {}
+    todo = [job for pos, job in enumerate(jobs) if pos not in reuse]
+    generated = _timed(renderer.synthesize(todo))
+
+    # Write next to the output, keeping the extension so the format matches.
+    directory, name = os.path.split(output_path)
+    tmp_path = os.path.join(directory, f".partial-{name}")
+    source = sf.SoundFile(output_path) if reuse else None
+    # PCM is copied as integers so reused audio is bit-identical.
+    copy_dtype = "int16" if source is not None and source.subtype == "PCM_16" else "float32"
+    target = None
+    sample_rate = old["sample_rate"] if old else None
+
+    segments = []
+    frames = 0
+    spent = saved = 0.0
+    try:
+        for pos, job in enumerate(jobs):
+            if pos in reuse:
+                entry = reuse[pos]
+                audio, length, seconds = None, entry["length"], entry["seconds"]
+                saved += seconds
+            else:
+                (_, audio, sample_rate), seconds = next(generated)
+                length = len(audio)
+                spent += seconds
+
+            if target is None:
+                subtype = source.subtype if source is not None else None
+                target = sf.SoundFile(tmp_path, "w", samplerate=sample_rate, channels=1, subtype=subtype)
+
+            if audio is None:
+                source.seek(entry["offset"])
+                for start in range(0, length, COPY_BLOCK_FRAMES):
+                    target.write(source.read(min(COPY_BLOCK_FRAMES, length - start), dtype=copy_dtype))
+            else:
+                target.write(audio)
+
+            gap = pause_samples(sample_rate, job.pause)
+            target.write(np.zeros(gap, dtype=np.float32))
+            segments.append({
+                "index": job.index,
+                "hash": hashes[job.index],
+                "offset": frames,
+                "length": length,
+                "pause": gap,
+                "seconds": seconds,
+            })
+            frames += length + gap
+    finally:
+        if source is not None:
+            source.close()
+        if target is not None:
+            target.close()
+
+    os.replace(tmp_path, output_path)
+    with open(manifest_path(output_path), "w") as f:
+        json.dump({"sample_rate": sample_rate, "frames": frames, "segments": segments}, f, indent=1)
+
+    logger.info(
+        "Reused %d/%d segments, regenerated %d in %.1fs; a full render would take ~%.1fs (saved ~%.1fs)",
+        len(reuse), len(jobs), len(todo), spent, spent + saved, saved,
+    )
+    return output_path
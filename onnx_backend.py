@@ -0,0 +1,270 @@
+"""
+ONNX Runtime backend for the codec decoder (CPU serving).
+
+The speech tokenizer's decoder (quantizer lookup, pre-transformer, upsampling
+convs and the vocoder blocks) turns the talker's 16-codebook codes back into
+24 kHz audio. ``generate_custom_voice`` runs it once per 300-frame chunk.
+The decoder is a fixed feed-forward graph, so it exports cleanly to ONNX:
+
+- ``export_codec`` writes it once per checkpoint to ``ONNX_CACHE_DIR``
+  (keyed on the model fingerprint, with a dynamic frame axis),
+- ``OrtCodec.install`` loads it into an onnxruntime session with its own
+  intra/inter-op thread counts, checks parity against PyTorch on random
+  codes, then routes the decoder's forward through ORT. It keeps PyTorch if
+  the export or the session fails, or if the outputs diverge.
+
+The dynamo exporter needs ``onnx`` and ``onnxscript`` (pinned in r1.txt).
+
+The talker and code predictor stay in PyTorch. Both run inside HF
+``generate`` with a KV cache and sampling, and qwen_tts exposes no
+per-step hook to hand them to another runtime.
+
+Parity and throughput on a script's segments (the codes are captured from a
+real render), with a sweep over intra-op thread counts:
+
+    python onnx_backend.py pod_nomura_jp1
+    python onnx_backend.py pod_nomura_jp1 --intra-threads 2 4 8 --inter-threads 1
+"""
+import argparse
+import copy
+import importlib
+import logging
+import os
+import time
+
+import numpy as np
+
+logger = logging.getLogger("onnx_backend")
+
+# =============================
+# CONFIG
+# =============================
+BACKENDS = ("torch", "onnx")
+ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "qwen3tts", "onnx")
+OPSET = 18
+PARITY_FRAMES = 75
+# torch.export specializes size-1 dims, so trace with a batch that stays symbolic.
+EXPORT_BATCH = 2
+PARITY_TOLERANCE = 1e-3  # max |diff| on a [-1, 1] waveform
+
+
+def codec_path(model_path, cache_dir=ONNX_CACHE_DIR):
+    from segment_cache import model_fingerprint
+
+    return os.path.join(cache_dir, f"codec-{model_fingerprint(model_path)}.onnx")
+
+
+def export_codec(model, path, opset=OPSET):
+    """Export ``speech_tokenizer.model.decoder`` (fp32) to ``path``; codes are (batch, quantizers, frames)."""
+    import torch
+
+    decoder = model.model.speech_tokenizer.model.decoder
+    if next(decoder.parameters()).dtype != torch.float32:
+        decoder = copy.deepcopy(decoder).float()
+    config = decoder.config
+    codes = torch.randint(0, config.codebook_size, (EXPORT_BATCH, config.num_quantizers, PARITY_FRAMES))
+    frames = torch.export.Dim("frames", min=2, max=4096)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Export next to the target and rename, so parallel workers never load a partial file.
+    tmp = f"{path}.{os.getpid()}.tmp.onnx"
+    start = time.perf_counter()
+    try:
+        with torch.inference_mode():
+            torch.onnx.export(
+                decoder.eval(), (codes,), tmp,
+                input_names=["codes"], output_names=["wav"],
+                dynamic_shapes={"codes": {0: torch.export.Dim("batch", max=64), 2: frames}},
+                opset_version=opset, dynamo=True, external_data=False,
+            )
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    logger.info("Exported codec decoder to %s in %.1fs", path, time.perf_counter() - start)
+    return path
+
+
+def session_options(intra_threads=None, inter_threads=1):
+    """
+    ORT session options for the codec. Defaults to torch's thread count for
+    intra-op and a single inter-op thread (the graph is a chain, so parallel
+    branches buy nothing). Spinning is off so idle ORT threads do not compete
+    with the talker's torch threads between chunks.
+    """
+    import onnxruntime as ort
+    import torch
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_threads or torch.get_num_threads()
+    options.inter_op_num_threads = inter_threads
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+    options.add_session_config_entry("session.inter_op.allow_spinning", "0")
+    return options
+
+
+class OrtCodec:
+    """Install with ``OrtCodec.install(model, model_path)``; ``uninstall`` restores PyTorch."""
+
+    def __init__(self, path, intra_threads=None, inter_threads=1):
+        import onnxruntime as ort
+
+        self.path = path
+        self.intra_threads = intra_threads
+        self.inter_threads = inter_threads
+        self.session = ort.InferenceSession(
+            path, session_options(intra_threads, inter_threads), providers=["CPUExecutionProvider"],
+        )
+        self.decoder = None
+
+    @classmethod
+    def install(cls, model, model_path, cache_dir=ONNX_CACHE_DIR, intra_threads=None, inter_threads=1):
+        """Export if needed, check parity and hook the decoder; returns None if ORT is not used."""
+        existing = getattr(model, "_onnx_codec", None)
+        if existing is not None:
+            return existing
+        path = codec_path(model_path, cache_dir)
+        try:
+            decoder = model.model.speech_tokenizer.model.decoder
+            if not os.path.isfile(path):
+                export_codec(model, path)
+            codec = cls(path, intra_threads, inter_threads)
+            diff = max(codec.parity(decoder, batch=batch) for batch in (1, EXPORT_BATCH))
+        except Exception as exc:
+            logger.warning("ONNX codec unavailable (%s: %s); keeping PyTorch", type(exc).__name__, exc)
+            return None
+        if diff > PARITY_TOLERANCE:
+            logger.warning("ONNX codec differs from PyTorch (max |diff| %.2e); keeping PyTorch", diff)
+            return None
+        codec.decoder = decoder
+        decoder.forward = codec.forward
+        model._onnx_codec = codec
+        logger.info("Codec decoder on onnxruntime (%s intra / %d inter threads, max |diff| %.1e)",
+                    codec.intra_threads or "torch", inter_threads, diff)
+        return codec
+
+    def uninstall(self, model):
+        del self.decoder.forward
+        del model._onnx_codec
+        self.decoder = None
+
+    def forward(self, codes):
+        """Drop-in for the decoder's forward: codes tensor in, clamped waveform tensor out."""
+        import torch
+
+        wav, = self.session.run(None, {"codes": codes.detach().cpu().numpy().astype(np.int64)})
+        dtype = next(self.decoder.parameters()).dtype if self.decoder is not None else torch.float32
+        return torch.from_numpy(wav).to(device=codes.device, dtype=dtype)
+
+    def parity(self, decoder, frames=PARITY_FRAMES, batch=1, seed=0):
+        """Max |diff| between PyTorch and ORT on random codes of ``batch`` x ``frames`` frames."""
+        import torch
+
+        config = decoder.config
+        generator = torch.Generator().manual_seed(seed)
+        codes = torch.randint(0, config.codebook_size, (batch, config.num_quantizers, frames),
+                              generator=generator)
+        with torch.inference_mode():
+            reference = decoder(codes).float().numpy()
+        return float(np.max(np.abs(reference - self.forward(codes).float().numpy())))
+
+
+# =============================
+# BENCHMARK
+# =============================
+def capture_codes(model, jobs):
+    """Render ``jobs`` greedily and return the code chunks the decoder saw, per job."""
+    import torch
+
+    from renderer import GREEDY
+
+    decoder = model.model.speech_tokenizer.model.decoder
+    original = decoder.forward
+    captured = []
+
+    def record(codes):
+        captured[-1].append(codes.clone())
+        return original(codes)
+
+    decoder.forward = record
+    try:
+        for job in jobs:
+            captured.append([])
+            torch.manual_seed(0)
+            model.generate_custom_voice(text=job.text, language=job.language, speaker=job.speaker,
+                                        instruct=job.instruct, **GREEDY)
+    finally:
+        del decoder.forward
+    return captured
+
+
+def _time(forward, chunks):
+    import torch
+
+    start = time.perf_counter()
+    with torch.inference_mode():
+        wavs = [forward(codes).float().numpy() for codes in chunks]
+    return time.perf_counter() - start, wavs
+
+
+def main(argv=None):
+    import torch
+
+    from renderer import load_model, plan_segments, resolve_model_path
+
+    parser = argparse.ArgumentParser(description="PyTorch vs onnxruntime codec decoder: parity and throughput.")
+    parser.add_argument("script", nargs="?", default="pod_nomura_jp1")
+    parser.add_argument("--segments", type=int, default=8, help="How many segments of the script to use.")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--cache-dir", default=ONNX_CACHE_DIR)
+    parser.add_argument("--intra-threads", type=int, nargs="+", default=[torch.get_num_threads()])
+    parser.add_argument("--inter-threads", type=int, default=1)
+    parser.add_argument("--re-export", action="store_true", help="Export again even if the file exists.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    episode = importlib.import_module(args.script)
+    jobs = plan_segments(episode.PODCAST_SEGMENTS, episode.VOICES, episode.LANGUAGE)[:args.segments]
+    model_path = resolve_model_path(args.model_path)
+    model = load_model(model_path)
+    decoder = model.model.speech_tokenizer.model.decoder
+    sample_rate = model.model.speech_tokenizer.get_output_sample_rate()
+
+    path = codec_path(model_path, args.cache_dir)
+    if args.re_export or not os.path.isfile(path):
+        export_codec(model, path)
+    captured = capture_codes(model, jobs)
+
+    _time(decoder, captured[0])  # warm up allocators before timing anything
+    codecs = [OrtCodec(path, threads, args.inter_threads) for threads in args.intra_threads]
+    print(f"\n{args.script}, {len(jobs)} segments, codec decoder only")
+    print(f"{'seg':>4}{'frames':>8}{'torch ms':>10}"
+          + "".join(f"{f'ort x{codec.intra_threads} ms':>16}" for codec in codecs) + f"{'max |diff|':>12}")
+    totals = np.zeros(1 + len(codecs))
+    audio_seconds = 0.0
+    for job, chunks in zip(jobs, captured):
+        seconds, reference = _time(decoder, chunks)
+        row = [seconds]
+        diff = 0.0
+        for codec in codecs:
+            _time(codec.forward, chunks[:1])
+            seconds, wavs = _time(codec.forward, chunks)
+            row.append(seconds)
+            diff = max([diff] + [float(np.max(np.abs(a - b))) for a, b in zip(reference, wavs)])
+        totals += row
+        audio_seconds += sum(wav.shape[-1] for wav in reference) / sample_rate
+        frames = sum(codes.shape[-1] for codes in chunks)
+        print(f"{job.index:>4}{frames:>8}" + f"{1000 * row[0]:>10.1f}"
+              + "".join(f"{1000 * s:>16.1f}" for s in row[1:]) + f"{diff:>12.2e}")
+
+    print(f"\ncodec real-time factor (audio seconds / compute seconds) over {audio_seconds:.1f}s of audio: "
+          f"torch {audio_seconds / totals[0]:.1f}")
+    for codec, seconds in zip(codecs, totals[1:]):
+        print(f"  ort intra={codec.intra_threads} inter={args.inter_threads}: "
+              f"{audio_seconds / seconds:.1f} ({totals[0] / seconds:.2f}x torch)")
+
+
+if __name__ == "__main__":
+    main()
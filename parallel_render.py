@@ -0,0 +1,202 @@
+"""
+Multi-process rendering for many-core CPU hosts.
+
+One PyTorch process does not scale linearly across 64 cores when it decodes
+one segment at a time. ParallelRenderer shards the segments across N worker
+processes, each pinned to its own contiguous block of cores with a matching
+``torch.set_num_threads``, and hands results back in script order.
+
+Benchmark segments/sec against the worker count with:
+
+    python parallel_render.py pod_nomura_en --workers 1 2 4 8
+"""
+import argparse
+import importlib
+import json
+import logging
+import multiprocessing as mp
+import os
+import queue
+import time
+import traceback
+from dataclasses import replace
+
+from renderer import Renderer, RenderOptions, plan_segments
+
+logger = logging.getLogger("parallel_render")
+
+# How often the parent checks that its workers are still alive while waiting.
+WORKER_POLL_SECONDS = 5.0
+
+
+def core_sets(workers, cores=None):
+    """Split the usable cores into ``workers`` contiguous blocks."""
+    cores = sorted(cores if cores is not None else os.sched_getaffinity(0))
+    if workers > len(cores):
+        logger.warning("%d workers on %d cores: workers will share cores", workers, len(cores))
+        return [[cores[worker % len(cores)]] for worker in range(workers)]
+    size, extra = divmod(len(cores), workers)
+    blocks, start = [], 0
+    for worker in range(workers):
+        end = start + size + (1 if worker < extra else 0)
+        blocks.append(cores[start:end])
+        start = end
+    return blocks
+
+
+def shard_jobs(jobs, workers):
+    """Longest-first assignment to the least loaded worker (by characters)."""
+    shards = [[] for _ in range(workers)]
+    loads = [0] * workers
+    for job in sorted(jobs, key=lambda job: len(job.text), reverse=True):
+        target = loads.index(min(loads))
+        shards[target].append(job)
+        loads[target] += len(job.text)
+    for shard in shards:
+        shard.sort(key=lambda job: job.index)
+    return shards
+
+
+def _worker(worker_id, cores, threads, options, jobs, results):
+    try:
+        import torch
+
+        os.sched_setaffinity(0, cores)
+        torch.set_num_threads(threads)
+
+        start = time.perf_counter()
+        renderer = Renderer(options)
+        renderer.model
+        results.put(("ready", worker_id, time.perf_counter() - start))
+
+        # Only the model step runs here; normalization, sentence splitting
+        # and tempo are applied once, by the parent's synthesize.
+        for job, wav, sr in renderer._generate(jobs):
+            results.put(("segment", job.index, (wav, sr)))
+        results.put(("done", worker_id, None))
+    except Exception:
+        results.put(("error", worker_id, traceback.format_exc()))
+
+
+class ParallelRenderer(Renderer):
+    """
+    Renderer whose generation step fans out to ``options.workers`` processes.
+    One worker runs in-process unless ``spawn_single`` is set (the benchmark
+    sets it so every row pays the same pinned, spawned setup).
+    """
+
+    def __init__(self, options=None, spawn_single=False):
+        super().__init__(options)
+        self.spawn_single = spawn_single
+        self.load_seconds = []
+
+    def _generate(self, jobs):
+        workers = min(self.options.workers, len(jobs))
+        if workers < 1 or (workers == 1 and not self.spawn_single):
+            yield from super()._generate(jobs)
+            return
+
+        ctx = mp.get_context("spawn")
+        results = ctx.Queue()
+        # Workers never touch the segment cache; the parent owns it.
+        worker_options = replace(self.options, cache_dir=None, workers=1)
+        blocks = core_sets(workers)
+        processes = []
+        for worker_id, (cores, shard) in enumerate(zip(blocks, shard_jobs(jobs, workers))):
+            threads = self.options.threads_per_worker or len(cores)
+            proc = ctx.Process(
+                target=_worker,
+                args=(worker_id, cores, threads, worker_options, shard, results),
+                daemon=True,
+            )
+            proc.start()
+            processes.append(proc)
+
+        by_index = {job.index: job for job in jobs}
+        pending = [job.index for job in jobs]
+        done = {}
+        running = set(range(workers))
+        try:
+            while running:
+                try:
+                    kind, key, payload = results.get(timeout=WORKER_POLL_SECONDS)
+                except queue.Empty:
+                    # A worker killed outright (OOM killer, segfault) never posts "error".
+                    dead = [worker_id for worker_id in running if processes[worker_id].exitcode is not None]
+                    if dead:
+                        raise RuntimeError(", ".join(f"Render worker {worker_id} died with exit code "
+                                                     f"{processes[worker_id].exitcode}" for worker_id in dead))
+                    continue
+                if kind == "error":
+                    raise RuntimeError(f"Render worker {key} failed:\n{payload}")
+                if kind == "ready":
+                    self.load_seconds.append(payload)
+                elif kind == "done":
+                    running.discard(key)
+                else:
+                    done[key] = payload
+                    while pending and pending[0] in done:
+                        index = pending.pop(0)
+                        yield (by_index[index], *done.pop(index))
+        finally:
+            for proc in processes:
+                if proc.is_alive():
+                    proc.terminate()
+                proc.join()
+
+
+# =============================
+# BENCHMARK
+# =============================
+def benchmark(jobs, worker_counts, options=None):
+    options = options or RenderOptions()
+    rows = []
+    for workers in worker_counts:
+        renderer = ParallelRenderer(replace(options, workers=workers), spawn_single=True)
+        start = time.perf_counter()
+        audio_seconds = 0.0
+        for _, wav, sr in renderer.synthesize(jobs):
+            audio_seconds += len(wav) / sr
+        wall = time.perf_counter() - start
+
+        # Workers load in parallel, so the slowest load is what the run paid.
+        load = max(renderer.load_seconds)
+        threads = options.threads_per_worker or len(core_sets(workers)[0])
+        row = {
+            "workers": workers,
+            "threads_per_worker": threads,
+            "wall_seconds": wall,
+            "load_seconds": load,
+            "segments_per_second": len(jobs) / max(wall - load, 1e-9),
+            "real_time_factor": audio_seconds / max(wall - load, 1e-9),
+        }
+        rows.append(row)
+        logger.info(
+            "%2d workers x %2d threads: %.2f segments/s, RTF %.2f (load %.1fs, wall %.1fs)",
+            workers, threads, row["segments_per_second"], row["real_time_factor"], load, wall,
+        )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Segments/sec versus worker count.")
+    parser.add_argument("script", help="Episode module to replay, e.g. pod_nomura_en")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--threads-per-worker", type=int, default=None)
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--output", default=None, help="Write the result rows as JSON.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    episode = importlib.import_module(args.script)
+    jobs = plan_segments(episode.PODCAST_SEGMENTS, episode.VOICES, episode.LANGUAGE)
+    options = RenderOptions(model_path=args.model_path, threads_per_worker=args.threads_per_worker)
+
+    rows = benchmark(jobs, args.workers, options)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Speed / memory / quality comparison of the CPU precision modes.
+
+Each precision is measured in a fresh process (so RSS is not polluted by the
+previous model) on the repo's English and Japanese test lines, with greedy
+decoding so the outputs are comparable. Quality is the log-spectral distance
+to the fp32 waveform; anything above ``--max-lsd`` fails the guardrail.
+
+    python precision.py --precisions fp32 bf16 int8
+"""
+import argparse
+import json
+import logging
+import multiprocessing as mp
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bench import _peak_rss_mb, _rss_mb
+from renderer import GREEDY, PRECISIONS, RenderOptions, Renderer, plan_segments
+
+# =============================
+# CONFIG
+# =============================
+MAX_LSD_DB = 6.0
+MAX_DURATION_DELTA = 0.15
+N_FFT = 1024
+HOP = 256
+
+
+def reference_jobs():
+    """The test_tts.py (English) and test_tts1.py (Japanese) lines."""
+    import test_tts
+    import test_tts1
+
+    jobs = plan_segments(test_tts.SEGMENTS, test_tts.VOICES, "English")
+    for segments in (test_tts1.OUTPUT11, test_tts1.OUTPUT12):
+        for job in plan_segments(segments, test_tts1.VOICES, "Japanese"):
+            job.index = len(jobs)
+            jobs.append(job)
+    return jobs
+
+
+def log_spectrum(wav):
+    frames = 1 + max(0, len(wav) - N_FFT) // HOP
+    if len(wav) < N_FFT:
+        wav = np.pad(wav, (0, N_FFT - len(wav)))
+    idx = np.arange(N_FFT)[None, :] + HOP * np.arange(frames)[:, None]
+    spec = np.abs(np.fft.rfft(wav[idx] * np.hanning(N_FFT), axis=1))
+    return 20 * np.log10(spec + 1e-5)
+
+
+def log_spectral_distance(reference, candidate):
+    """RMS dB difference between STFT magnitudes over the common length."""
+    a, b = log_spectrum(reference), log_spectrum(candidate)
+    frames = min(len(a), len(b))
+    return float(np.mean(np.sqrt(np.mean((a[:frames] - b[:frames]) ** 2, axis=1))))
+
+
+def _measure(model_path, precision, jobs):
+    import torch
+
+    torch.manual_seed(0)
+    options = RenderOptions(model_path=model_path, precision=precision, sampling=GREEDY)
+    renderer = Renderer(options)
+
+    start = time.perf_counter()
+    renderer.model
+    load = time.perf_counter() - start
+    rss_loaded = _rss_mb()
+
+    start = time.perf_counter()
+    wavs, sr = [], None
+    for _, wav, sr in renderer.synthesize(jobs):
+        wavs.append(wav)
+    synth = time.perf_counter() - start
+
+    return {
+        "precision": precision,
+        "load_seconds": load,
+        "synth_seconds": synth,
+        "rss_mb": rss_loaded,
+        "peak_rss_mb": _peak_rss_mb(),
+        "sample_rate": sr,
+        "wavs": wavs,
+    }
+
+
+def compare(model_path, precisions, max_lsd=MAX_LSD_DB):
+    jobs = reference_jobs()
+    ctx = mp.get_context("spawn")
+    results = {}
+    for precision in dict.fromkeys(("fp32", *precisions)):
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results[precision] = pool.submit(_measure, model_path, precision, jobs).result()
+
+    reference = results["fp32"]
+    rows = []
+    for precision, result in results.items():
+        audio = sum(len(wav) for wav in result["wavs"]) / result["sample_rate"]
+        lsd = [log_spectral_distance(r, c) for r, c in zip(reference["wavs"], result["wavs"])]
+        duration = [abs(len(c) - len(r)) / len(r) for r, c in zip(reference["wavs"], result["wavs"])]
+        lsd_by_language = {}
+        for job, distance in zip(jobs, lsd):
+            lsd_by_language[job.language] = max(distance, lsd_by_language.get(job.language, 0.0))
+        rows.append({
+            "precision": precision,
+            "load_seconds": result["load_seconds"],
+            "synth_seconds": result["synth_seconds"],
+            "real_time_factor": audio / result["synth_seconds"],
+            "speedup": reference["synth_seconds"] / result["synth_seconds"],
+            "rss_mb": result["rss_mb"],
+            "peak_rss_mb": result["peak_rss_mb"],
+            "lsd_db": lsd_by_language,
+            "max_duration_delta": max(duration),
+            "passed": max(lsd) <= max_lsd and max(duration) <= MAX_DURATION_DELTA,
+        })
+    return rows
+
+
+def print_table(rows):
+    print(f"{'precision':<10}{'load s':>8}{'synth s':>9}{'RTF':>8}{'speedup':>9}"
+          f"{'RSS MB':>9}{'LSD EN':>8}{'LSD JA':>8}{'dur Δ':>7}  guardrail")
+    for row in rows:
+        print(f"{row['precision']:<10}{row['load_seconds']:>8.1f}{row['synth_seconds']:>9.1f}"
+              f"{row['real_time_factor']:>8.2f}{row['speedup']:>8.2f}x{row['rss_mb']:>9.0f}"
+              f"{row['lsd_db'].get('English', 0):>8.2f}{row['lsd_db'].get('Japanese', 0):>8.2f}"
+              f"{100 * row['max_duration_delta']:>6.0f}%  {'ok' if row['passed'] else 'FAIL'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare fp32/bf16/int8 on the test lines.")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--precisions", nargs="+", choices=PRECISIONS, default=list(PRECISIONS))
+    parser.add_argument("--max-lsd", type=float, default=MAX_LSD_DB,
+                        help="Largest log-spectral distance to fp32 (dB) that still passes.")
+    parser.add_argument("--output", default=None, help="Write the rows as JSON.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    rows = compare(args.model_path, args.precisions, args.max_lsd)
+    print_table(rows)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+    return 0 if all(row["passed"] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Opt-in profiling of the render path.
+
+``--profile PREFIX`` on any episode script times every stage of every
+segment: prompt tokenization, the talker's LM decode loop, the codec
+(speech tokenizer) decode, the rest of generate_custom_voice, NumPy
+post-processing (tempo, crossfade, assembly) and the file write. It also
+samples RSS with psutil in the background. It writes:
+
+- ``PREFIX.trace.json``: Chrome trace (chrome://tracing or ui.perfetto.dev)
+  with one span per stage call and an RSS counter track,
+- ``PREFIX.folded``: folded stacks per segment for flamegraph.pl/speedscope,
+- a per-segment breakdown table on stdout.
+
+``--torch-profile`` also runs torch.profiler over the render (operator-level
+CPU time, ``PREFIX.torch.json``); the stage spans show up in it as
+record_function ranges.
+
+    python pod_nomura_jp1.py --profile profile/jp1
+    python pod_nomura_jp1.py --profile profile/jp1 --torch-profile
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+# =============================
+# CONFIG
+# =============================
+RSS_INTERVAL = 0.05
+STAGES = ("tokenize", "lm_decode", "codec", "generate_custom_voice", "tempo", "crossfade", "assemble", "write")
+
+_ACTIVE = None
+
+
+@contextmanager
+def span(name):
+    """Time a stage on the active profiler; free when profiling is off."""
+    if _ACTIVE is None:
+        yield
+        return
+    with _ACTIVE.span(name):
+        yield
+
+
+def set_segment(label):
+    """Attribute the spans that follow to segment ``label``."""
+    if _ACTIVE is not None and not _ACTIVE.pinned:
+        _ACTIVE.segment = str(label)
+
+
+@contextmanager
+def segment(label):
+    """Attribute everything inside to ``label``, overriding nested set_segment calls."""
+    if _ACTIVE is None:
+        yield
+        return
+    previous = _ACTIVE.pinned
+    _ACTIVE.segment = str(label)
+    _ACTIVE.pinned = True
+    try:
+        yield
+    finally:
+        _ACTIVE.pinned = previous
+
+
+class RssSampler:
+    """Samples this process's RSS with psutil in a background thread while entered."""
+
+    def __init__(self, interval=RSS_INTERVAL):
+        self.interval = interval
+        self.samples = []  # (time, bytes)
+        self._stop = threading.Event()
+        self._process = None
+        self._thread = None
+
+    @property
+    def peak(self):
+        return max((rss for _, rss in self.samples), default=0)
+
+    def _sample(self):
+        self.samples.append((time.perf_counter(), self._process.memory_info().rss))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        import psutil
+
+        self._process = psutil.Process()
+        self._stop.clear()
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        # Also catch the end state of a span shorter than the interval.
+        self._sample()
+
+
+class Profiler:
+    def __init__(self, torch_profile=False, rss_interval=RSS_INTERVAL):
+        self.torch_profile = torch_profile
+        self.spans = []    # (stack, segment, start, end, thread id)
+        self._rss = RssSampler(rss_interval)
+        self.rss = self._rss.samples  # (time, bytes)
+        self.segment = None
+        self.pinned = False
+        self._local = threading.local()
+        self._patches = []
+        self._torch = None
+        self.start = None
+
+    # ---- hooks into the model ----
+    def _wrap(self, owner, attr, name):
+        original = getattr(owner, attr)
+        self._patches.append((owner, attr, vars(owner).get(attr)))
+
+        def timed(*args, **kwargs):
+            with self.span(name):
+                return original(*args, **kwargs)
+
+        setattr(owner, attr, timed)
+
+    def install(self, model):
+        """Time the model's internal stages (tokenizer, LM decode, codec)."""
+        self._wrap(model, "generate_custom_voice", "generate_custom_voice")
+        self._wrap(model, "_tokenize_texts", "tokenize")
+        self._wrap(model.model, "generate", "lm_decode")
+        self._wrap(model.model.speech_tokenizer, "decode", "codec")
+        return self
+
+    def uninstall(self):
+        for owner, attr, previous in reversed(self._patches):
+            if previous is None:
+                delattr(owner, attr)
+            else:
+                setattr(owner, attr, previous)
+        self._patches = []
+
+    # ---- recording ----
+    @contextmanager
+    def span(self, name):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(name)
+        if self._torch is not None:
+            from torch.profiler import record_function
+            marker = record_function(name)
+        else:
+            marker = nullcontext()
+        start = time.perf_counter()
+        try:
+            with marker:
+                yield
+        finally:
+            self.spans.append((tuple(stack), self.segment, start, time.perf_counter(), threading.get_ident()))
+            stack.pop()
+
+    def __enter__(self):
+        global _ACTIVE
+        if self.torch_profile:
+            import torch.profiler
+            self._torch = torch.profiler.profile(activities=[torch.profiler.ProfilerActivity.CPU])
+            self._torch.__enter__()
+        self.start = time.perf_counter()
+        self._rss.__enter__()
+        _ACTIVE = self
+        return self
+
+    def __exit__(self, *exc):
+        global _ACTIVE
+        _ACTIVE = None
+        self._rss.__exit__(*exc)
+        if self._torch is not None:
+            self._torch.__exit__(*exc)
+        self.uninstall()
+
+    # ---- reports ----
+    def self_times(self):
+        """``{(segment, stack): seconds}`` excluding time spent in child spans."""
+        totals = defaultdict(float)
+        for stack, segment, start, end, _ in self.spans:
+            totals[(segment, stack)] += end - start
+            if len(stack) > 1:
+                totals[(segment, stack[:-1])] -= end - start
+        return totals
+
+    def breakdown(self):
+        """Per segment: self seconds per stage, wall span and peak RSS while it ran."""
+        segments = {}
+        for (segment, stack), seconds in self.self_times().items():
+            row = segments.setdefault(segment, defaultdict(float))
+            row[stack[-1]] += seconds
+        for segment, row in segments.items():
+            windows = [(start, end) for _, seg, start, end, _ in self.spans if seg == segment]
+            first, last = min(w[0] for w in windows), max(w[1] for w in windows)
+            # Short segments may fall between samples; use the one just before.
+            before = [rss for t, rss in self.rss if t <= last]
+            samples = [rss for t, rss in self.rss if first <= t <= last] or before[-1:] or [0]
+            row["total"] = sum(row[stage] for stage in STAGES)
+            row["peak_rss_mb"] = max(samples) / 1024 ** 2
+        return segments
+
+    def print_table(self, file=sys.stdout):
+        rows = self.breakdown()
+        columns = [stage for stage in STAGES if any(row[stage] for row in rows.values())]
+        print(f"{'segment':>10}" + "".join(f"{name:>{max(10, len(name) + 2)}}" for name in columns)
+              + f"{'total':>9}{'peak RSS':>10}", file=file)
+        totals = defaultdict(float)
+        for segment in sorted(rows, key=lambda s: (len(s or ""), s or "")):
+            row = rows[segment]
+            cells = "".join(f"{row[name]:>{max(10, len(name) + 2)}.3f}" for name in columns)
+            print(f"{segment or '-':>10}{cells}{row['total']:>9.2f}{row['peak_rss_mb']:>8.0f}MB", file=file)
+            for name in columns + ["total"]:
+                totals[name] += row[name]
+        cells = "".join(f"{totals[name]:>{max(10, len(name) + 2)}.3f}" for name in columns)
+        print(f"{'all':>10}{cells}{totals['total']:>9.2f}", file=file)
+        if totals["total"]:
+            top = max(columns, key=lambda name: totals[name])
+            print(f"Largest stage: {top} ({100 * totals[top] / totals['total']:.0f}% of profiled time)", file=file)
+
+    def write_folded(self, path):
+        with open(path, "w") as f:
+            for (segment, stack), seconds in sorted(self.self_times().items(), key=str):
+                micros = int(seconds * 1e6)
+                if micros > 0:
+                    f.write(f"segment {segment};{';'.join(stack)} {micros}\n")
+
+    def write_chrome_trace(self, path):
+        pid = os.getpid()
+        events = [{
+            "name": stack[-1], "ph": "X", "pid": pid, "tid": tid,
+            "ts": (start - self.start) * 1e6, "dur": (end - start) * 1e6,
+            "args": {"segment": segment},
+        } for stack, segment, start, end, tid in self.spans]
+        events += [{
+            "name": "rss", "ph": "C", "pid": pid, "ts": (t - self.start) * 1e6,
+            "args": {"MB": rss / 1024 ** 2},
+        } for t, rss in self.rss]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def report(self, prefix, file=sys.stdout):
+        if os.path.dirname(prefix):
+            os.makedirs(os.path.dirname(prefix), exist_ok=True)
+        self.print_table(file)
+        self.write_chrome_trace(f"{prefix}.trace.json")
+        self.write_folded(f"{prefix}.folded")
+        written = [f"{prefix}.trace.json", f"{prefix}.folded"]
+        if self._torch is not None:
+            print(self._torch.key_averages().table(sort_by="self_cpu_time_total", row_limit=15), file=file)
+            self._torch.export_chrome_trace(f"{prefix}.torch.json")
+            written.append(f"{prefix}.torch.json")
+        print("Profile written to " + ", ".join(written), file=file)
@@ -0,0 +1,578 @@
+"""
+Shared episode renderer for the podcast scripts.
+
+The pod*.py scripts only load their episode spec (episodes/*.yaml, see
+episode_spec.py) and hand its voices and segments to ``run_episode``.
+Model loading, the generation loop and writing the episode WAV live here,
+so every optimisation is made (and benchmarked) once.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+from assembly import EpisodeBuffer, assemble, pause_samples
+from audio_dsp import TEMPO_METHODS, time_stretch
+from chunking import synthesize_split
+from conditioning import ConditioningCache
+from episode_spec import speech_seconds
+from frontend import normalize_jobs, pretokenize
+from profiling import set_segment, span
+from segment_cache import DEFAULT_MAX_BYTES, SegmentCache, model_fingerprint
+from wav_sink import WavSink
+
+logger = logging.getLogger("renderer")
+
+# =============================
+# CONFIG
+# =============================
+OUTPUT_DIR = "podcast_output"
+DEVICE_MAP = "cpu"
+PRECISIONS = ("fp32", "bf16", "int8")
+# Deterministic decoding for the benchmarks and parity checks (``sampling=GREEDY``).
+GREEDY = {"do_sample": False, "subtalker_dosample": False}
+
+
+@dataclass
+class RenderOptions:
+    model_path: str = None
+    device_map: str = DEVICE_MAP
+    precision: str = "fp32"
+    output_dir: str = OUTPUT_DIR
+    batch_size: int = 1
+    # Extra generate_custom_voice kwargs (temperature, top_k, ...).
+    sampling: dict = field(default_factory=dict)
+    cache_dir: str = None
+    cache_max_bytes: int = DEFAULT_MAX_BYTES
+    resume: bool = False
+    workers: int = 1
+    threads_per_worker: int = None
+    # >1 speeds speech up; applied after the segment cache.
+    tempo: float = 1.0
+    tempo_method: str = "resample"
+    split_sentences: bool = False
+    # Rewrite dashes, ellipses, "%" ranges etc. before generation (frontend.py).
+    normalize: bool = True
+    # torch.compile the talker/code predictor/codec (compiled.py).
+    compile: bool = False
+    compile_cache_dir: str = None
+    # "onnx" runs the codec decoder through onnxruntime (onnx_backend.py).
+    codec_backend: str = "torch"
+    ort_intra_threads: int = None
+    ort_inter_threads: int = 1
+    # Map the safetensors weights instead of private copies (shared_weights.py).
+    share_weights: bool = False
+
+
+# =============================
+# LOAD MODEL
+# =============================
+_MODELS = {}
+
+
+def resolve_model_path(model_path=None):
+    if model_path is None:
+        from local_config import MODEL_PATH
+        model_path = MODEL_PATH
+    return model_path
+
+
+def load_model(model_path=None, device_map=DEVICE_MAP, precision="fp32", share_weights=False):
+    """
+    Load Qwen3TTSModel once per process; later calls reuse the instance.
+
+    ``precision`` is one of PRECISIONS: ``bf16`` loads the weights in
+    bfloat16 (AVX-512 BF16 / AMX on recent Xeons), ``int8`` loads fp32 and
+    swaps the talker's nn.Linear layers for dynamically quantized ones.
+    ``share_weights`` backs the weights with a memory map of the checkpoint
+    so concurrent processes share one copy (not with int8).
+    """
+    import torch
+    from qwen_tts import Qwen3TTSModel
+
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}, expected one of {PRECISIONS}")
+    if share_weights and precision == "int8":
+        raise ValueError("Shared weights need fp32 or bf16; int8 replaces the weights with quantized copies")
+
+    model_path = resolve_model_path(model_path)
+    key = (model_path, device_map, precision, share_weights)
+    if key not in _MODELS:
+        start = time.perf_counter()
+        model = Qwen3TTSModel.from_pretrained(
+            model_path,
+            device_map=device_map,
+            dtype=torch.bfloat16 if precision == "bf16" else torch.float32,
+        )
+        if precision == "int8":
+            # The speech tokenizer (codec) is a plain attribute, not a
+            # submodule, so it stays fp32; only the LM stack is quantized.
+            torch.ao.quantization.quantize_dynamic(
+                model.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True,
+            )
+        if share_weights:
+            from shared_weights import share_weights as map_weights
+            map_weights(model, model_path)
+        # Reuse the tokenized/projected instruct prompt across segments.
+        ConditioningCache.install(model)
+        _MODELS[key] = model
+        logger.info("Loaded %s (%s) in %.1fs", model_path, precision, time.perf_counter() - start)
+    return _MODELS[key]
+
+
+_FINGERPRINTS = {}
+
+
+def segment_fingerprint(options, model=None):
+    """
+    What segment cache keys depend on besides the job: checkpoint, precision,
+    codec backend. Given the loaded ``model``, the backend is the one actually
+    installed (OrtCodec falls back to PyTorch when export or parity fails).
+    """
+    model_path = resolve_model_path(options.model_path)
+    backend = options.codec_backend
+    if model is not None and backend == "onnx" and getattr(model, "_onnx_codec", None) is None:
+        backend = "torch"
+    key = (model_path, options.precision, backend)
+    if key not in _FINGERPRINTS:
+        fingerprint = f"{model_fingerprint(model_path)}:{options.precision}"
+        if backend != "torch":
+            fingerprint = f"{fingerprint}:{backend}"
+        _FINGERPRINTS[key] = fingerprint
+    return _FINGERPRINTS[key]
+
+
+# =============================
+# SEGMENTS
+# =============================
+@dataclass
+class SegmentJob:
+    index: int
+    role: str
+    text: str
+    speaker: str
+    language: str
+    instruct: str = None
+    pause: float = 0.0
+
+
+def plan_segments(segments, voices, language):
+    """
+    Resolve script segments against a voice map.
+
+    ``voices`` maps a role to ``{"speaker": ..., "instruct": ..., "pause": ...}``.
+    A segment's own ``instruct``/``pause``/``language`` keys win over the
+    role defaults.
+    """
+    jobs = []
+    for idx, seg in enumerate(segments):
+        voice = voices[seg["role"]]
+        jobs.append(SegmentJob(
+            index=idx,
+            role=seg["role"],
+            text=seg["text"],
+            speaker=voice["speaker"],
+            language=seg.get("language", language),
+            instruct=seg.get("instruct", voice.get("instruct")),
+            pause=seg.get("pause", voice.get("pause", 0.0)),
+        ))
+    return jobs
+
+
+# =============================
+# BATCHING
+# =============================
+def plan_batches(jobs, max_batch_size):
+    """
+    Group jobs into ``generate_custom_voice`` batches of similar spoken length.
+
+    Jobs are sorted by estimated duration (characters over the language's
+    speaking rate) so a batch never pairs a one-line host prompt with a
+    paragraph-long guest answer, even when languages mix (variants.py); the
+    last batch may be short.
+    """
+    ordered = sorted(jobs, key=speech_seconds)
+    return [ordered[i:i + max_batch_size] for i in range(0, len(ordered), max_batch_size)]
+
+
+def padding_waste(lengths):
+    """Fraction of a padded batch (longest item x batch size) that is padding."""
+    longest = max(lengths)
+    if not longest:
+        return 0.0
+    return 1.0 - sum(lengths) / (longest * len(lengths))
+
+
+# =============================
+# RENDERER
+# =============================
+class Renderer:
+    def __init__(self, options=None, model=None):
+        self.options = options or RenderOptions()
+        self._model = model
+        self.batch_reports = []
+        self.planned_keys = {}
+        self.cache = None
+        if self.options.cache_dir:
+            self.cache = SegmentCache(self.options.cache_dir, self.options.cache_max_bytes)
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = load_model(
+                self.options.model_path, self.options.device_map, self.options.precision,
+                self.options.share_weights,
+            )
+            if self.options.codec_backend == "onnx":
+                from onnx_backend import OrtCodec
+                OrtCodec.install(self._model, resolve_model_path(self.options.model_path),
+                                 intra_threads=self.options.ort_intra_threads,
+                                 inter_threads=self.options.ort_inter_threads)
+            if self.options.compile:
+                from compiled import COMPILE_CACHE_DIR, compile_model
+                compile_model(self._model, self.options.compile_cache_dir or COMPILE_CACHE_DIR)
+        return self._model
+
+    def fingerprint(self):
+        """segment_fingerprint for this renderer; an ONNX codec is only counted once it is installed."""
+        model = self.model if self.options.codec_backend != "torch" else None
+        return segment_fingerprint(self.options, model)
+
+    def segment_keys(self, jobs):
+        """Content hash per job index (what the segment cache is keyed on)."""
+        fingerprint = self.fingerprint()
+        keys = {}
+        for job in jobs:
+            key = self.planned_keys.get((job.text, job.speaker, job.instruct, job.language))
+            keys[job.index] = key or SegmentCache.key(job, fingerprint, self.options.sampling)
+        return keys
+
+    def use_plan(self, plan):
+        """Reuse a RenderPlan's cache keys (if it was compiled for this model and sampling); returns its jobs."""
+        if plan.fingerprint == self.fingerprint() and plan.sampling == self.options.sampling:
+            for job in plan.jobs:
+                self.planned_keys[(job.text, job.speaker, job.instruct, job.language)] = plan.keys[job.index]
+        return plan.jobs
+
+    def synthesize(self, jobs):
+        """Yield ``(job, wav, sample_rate)`` for every job, in script order."""
+        if self.options.normalize:
+            jobs = normalize_jobs(jobs)
+        if self.options.split_sentences:
+            results = synthesize_split(self._synthesize_cached, jobs)
+        else:
+            results = self._synthesize_cached(jobs)
+
+        if self.options.tempo == 1.0:
+            yield from results
+            return
+        for job, wav, sr in results:
+            with span("tempo"):
+                wav = time_stretch(wav, sr, self.options.tempo, self.options.tempo_method)
+            yield job, wav, sr
+
+    def _synthesize_cached(self, jobs):
+        if self.cache is None:
+            yield from self._generate(jobs)
+            return
+
+        keys = self.segment_keys(jobs)
+        cached = {}
+        for job in jobs:
+            hit = self.cache.get(keys[job.index])
+            if hit is not None:
+                cached[job.index] = hit
+
+        # Only cache misses reach the model (which is not even loaded when
+        # every segment hits).
+        generated = self._generate([job for job in jobs if job.index not in cached])
+        for job in jobs:
+            if job.index in cached:
+                yield (job, *cached[job.index])
+            else:
+                job, wav, sr = next(generated)
+                self.cache.put(keys[job.index], wav, sr)
+                yield job, wav, sr
+        next(generated, None)  # let the generator finish its own bookkeeping
+
+        stats = self.cache.stats()
+        logger.info(
+            "Segment cache: %d hits, %d misses, %d evictions, %.1f MB in %d files",
+            stats["hits"], stats["misses"], stats["evictions"],
+            stats["bytes"] / 1e6, stats["entries"],
+        )
+
+    def _generate(self, jobs):
+        if jobs:
+            with span("tokenize"):
+                pretokenize(self.model, jobs)
+        if self.options.batch_size <= 1:
+            yield from self._generate_each(jobs)
+        else:
+            yield from self._generate_batched(jobs)
+        conditioning = getattr(self._model, "_conditioning_cache", None)
+        if conditioning is not None:
+            conditioning.log_stats()
+
+    def _generate_each(self, jobs):
+        for job in jobs:
+            set_segment(job.index)
+            wavs, sr = self.model.generate_custom_voice(
+                text=job.text,
+                language=job.language,
+                speaker=job.speaker,
+                instruct=job.instruct,
+                **self.options.sampling,
+            )
+            yield job, wavs[0], sr
+
+    def _generate_batched(self, jobs):
+        # Batches run in length order; results are held back until every
+        # earlier segment is done so callers still see script order.
+        pending = list(jobs)
+        done = {}
+        for batch in plan_batches(jobs, self.options.batch_size):
+            for job, wav, sr in self._generate_batch(batch):
+                done[job.index] = (job, wav, sr)
+            while pending and pending[0].index in done:
+                yield done.pop(pending.pop(0).index)
+
+    def _generate_batch(self, batch):
+        set_segment("+".join(str(job.index) for job in batch))
+        start = time.perf_counter()
+        wavs, sr = self.model.generate_custom_voice(
+            text=[job.text for job in batch],
+            language=[job.language for job in batch],
+            speaker=[job.speaker for job in batch],
+            instruct=[job.instruct or "" for job in batch],
+            **self.options.sampling,
+        )
+        elapsed = time.perf_counter() - start
+
+        report = {
+            "segments": [job.index for job in batch],
+            "seconds": elapsed,
+            "audio_seconds": sum(len(wav) for wav in wavs) / sr,
+            "text_padding": padding_waste([len(job.text) for job in batch]),
+            "audio_padding": padding_waste([len(wav) for wav in wavs]),
+        }
+        self.batch_reports.append(report)
+        logger.info(
+            "Batch %s: %.1fs for %.1fs audio, padding waste %.0f%% text / %.0f%% audio",
+            report["segments"], elapsed, report["audio_seconds"],
+            100 * report["text_padding"], 100 * report["audio_padding"],
+        )
+        return zip(batch, wavs, [sr] * len(batch))
+
+    def render_array(self, jobs, memmap_path=None):
+        """
+        Render into one preallocated float32 buffer (a memmap when
+        ``memmap_path`` is given). Returns ``(audio, sample_rate, offsets)``.
+        """
+        wavs, sample_rate = [], None
+        for _, wav, sample_rate in self.synthesize(jobs):
+            wavs.append(wav)
+        with span("assemble"):
+            audio, offsets = assemble(wavs, [job.pause for job in jobs], sample_rate, memmap_path)
+        return audio, sample_rate, offsets
+
+    def render_to_buffer(self, jobs, directory):
+        """
+        Spill segments into an on-disk EpisodeBuffer as they are generated.
+        The leading segments already in the buffer (from an interrupted run)
+        are kept if their content key and pause still match; everything from
+        the first mismatch on is dropped and rendered again.
+        """
+        from manifest import segment_hashes
+
+        buffer = EpisodeBuffer(directory)
+        keys = segment_hashes(self, jobs)
+        frames = kept = 0
+        for job in jobs:
+            entry = buffer.segments.get(job.index)
+            if entry is None or entry.get("key") != keys[job.index] or entry["offset"] != frames \
+                    or entry["pause"] != pause_samples(buffer.sample_rate, job.pause):
+                break
+            frames += entry["length"] + entry["pause"]
+            kept += 1
+        if frames != buffer.frames:
+            logger.info("Buffer %s: keeping %d segments, re-rendering the rest", directory, kept)
+            buffer.truncate(frames)
+        for job, wav, sr in self.synthesize(jobs[kept:]):
+            set_segment(job.index)
+            with span("write"):
+                buffer.append(job.index, wav, sr, pause=job.pause, key=keys[job.index])
+        return buffer
+
+    def render(self, jobs, output_path):
+        """Stream every segment (and its pause) into ``output_path``."""
+        with WavSink(output_path, resume=self.options.resume) as sink:
+            if sink.completed:
+                logger.info("Resuming %s after %d segments", output_path, len(sink.completed))
+            todo = [job for job in jobs if job.index not in sink.completed]
+            for job, wav, sr in self.synthesize(todo):
+                set_segment(job.index)
+                with span("write"):
+                    sink.append(job.index, wav, sr, pause=job.pause)
+        return output_path
+
+
+# =============================
+# SCRIPT ENTRY POINT
+# =============================
+def build_arg_parser(description=None, output_dir=OUTPUT_DIR):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--model-path", default=None,
+                        help="Checkpoint directory (defaults to local_config.MODEL_PATH).")
+    parser.add_argument("--output-dir", default=output_dir)
+    parser.add_argument("--precision", choices=PRECISIONS, default="fp32",
+                        help="Weight precision on CPU (see precision.py for the accuracy check).")
+    parser.add_argument("--server", default=None,
+                        help="Render through a running tts_server.py (unix:/path.sock or http://host:port).")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Segments per generate_custom_voice call, grouped by text length.")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Reuse generated segments from this directory (only changed lines are re-run).")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / 1024 ** 2)
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue a partially written episode instead of starting over.")
+    parser.add_argument("--stream", choices=["file", "stdout"], default=None,
+                        help="Preview mode: emit audio chunks as soon as each segment is ready "
+                             "(growing WAV or raw s16le PCM on stdout) and report time-to-first-audio.")
+    parser.add_argument("--split-sentences", action="store_true",
+                        help="Generate long segments sentence by sentence (batch them with --batch-size) "
+                             "and crossfade the pieces back together.")
+    parser.add_argument("--no-normalize", dest="normalize", action="store_false",
+                        help="Send segment text to the model as written (skip frontend.py normalization).")
+    parser.add_argument("--tempo", type=float, default=1.0,
+                        help="Speed factor applied to every segment, e.g. 1.05.")
+    parser.add_argument("--tempo-method", choices=TEMPO_METHODS, default="resample",
+                        help="resample: pitch rises with speed (soxr); wsola: pitch preserved.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Diff against the last render's manifest and only regenerate changed segments.")
+    parser.add_argument("--buffer-dir", default=None,
+                        help="Build the episode in an on-disk raw PCM buffer, then export it "
+                             "(use a .flac filename for FLAC). For multi-hour episodes.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Render in this many processes, each pinned to its own block of cores.")
+    parser.add_argument("--threads-per-worker", type=int, default=None,
+                        help="torch.set_num_threads per worker (defaults to its core count).")
+    parser.add_argument("--compile", action="store_true",
+                        help="torch.compile (inductor) the decoder and codec; the first run on a host "
+                             "pays the compile, later runs reuse --compile-cache-dir.")
+    parser.add_argument("--compile-cache-dir", default=None,
+                        help="Persistent inductor cache (default ~/.cache/qwen3tts/inductor).")
+    parser.add_argument("--share-weights", action="store_true",
+                        help="Memory-map the safetensors weights so concurrent renders share one copy in RAM.")
+    parser.add_argument("--codec-backend", choices=("torch", "onnx"), default="torch",
+                        help="onnx: export the codec decoder once and run it on onnxruntime.")
+    parser.add_argument("--ort-threads", type=int, default=None,
+                        help="onnxruntime intra-op threads for the codec (defaults to torch's).")
+    parser.add_argument("--ort-inter-threads", type=int, default=1)
+    parser.add_argument("--video", nargs="?", const="waveform", choices=("waveform", "spectrum"), default=None,
+                        help="Also write an MP4 of the episode with a waveform (default) or spectrum animation.")
+    parser.add_argument("--profile", default=None, metavar="PREFIX",
+                        help="Time tokenize/LM decode/codec/post-processing/write per segment and write "
+                             "PREFIX.trace.json (Chrome trace) and PREFIX.folded (flame graph).")
+    parser.add_argument("--torch-profile", action="store_true",
+                        help="With --profile, also capture torch.profiler operator times (PREFIX.torch.json).")
+    return parser
+
+
+def options_from_args(args):
+    return RenderOptions(
+        model_path=args.model_path,
+        precision=args.precision,
+        output_dir=args.output_dir,
+        batch_size=args.batch_size,
+        cache_dir=args.cache_dir,
+        cache_max_bytes=int(args.cache_max_mb * 1024 ** 2),
+        resume=args.resume,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        tempo=args.tempo,
+        tempo_method=args.tempo_method,
+        split_sentences=args.split_sentences,
+        normalize=args.normalize,
+        compile=args.compile,
+        compile_cache_dir=args.compile_cache_dir,
+        share_weights=args.share_weights,
+        codec_backend=args.codec_backend,
+        ort_intra_threads=args.ort_threads,
+        ort_inter_threads=args.ort_inter_threads,
+    )
+
+
+def run_episode(segments, voices, language, filename, argv=None, output_dir=OUTPUT_DIR):
+    """Command-line entry point shared by the pod*.py scripts."""
+    parser = build_arg_parser(description=f"Render {filename}", output_dir=output_dir)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.server and args.incremental:
+        parser.error("--incremental needs local segment hashes; it cannot be combined with --server")
+    if args.server and args.buffer_dir:
+        parser.error("--buffer-dir builds the episode locally; it cannot be combined with --server")
+    if args.server and (args.cache_dir or args.resume):
+        parser.error("--cache-dir/--resume work on local files; the server renders without them")
+    if args.server and (args.workers > 1 or args.precision != "fp32" or args.compile or args.share_weights
+                        or args.codec_backend != "torch"):
+        parser.error("--workers/--precision/--compile/--share-weights/--codec-backend are fixed when "
+                     "the server starts (tts_server.py); drop them with --server")
+    if args.profile and (args.server or args.workers > 1):
+        parser.error("--profile instruments the in-process model; drop --server/--workers")
+
+    options = options_from_args(args)
+    os.makedirs(options.output_dir, exist_ok=True)
+
+    if args.server:
+        from tts_server import RemoteRenderer
+        renderer = RemoteRenderer(args.server, options)
+    elif options.workers > 1:
+        from parallel_render import ParallelRenderer
+        renderer = ParallelRenderer(options)
+    else:
+        renderer = Renderer(options)
+    jobs = plan_segments(segments, voices, language)
+    audio_path = os.path.join(options.output_dir, filename)
+
+    profiler = nullcontext()
+    if args.profile:
+        from profiling import Profiler
+        profiler = Profiler(torch_profile=args.torch_profile).install(renderer.model)
+    with profiler:
+        saved = _dispatch(args, renderer, jobs, audio_path)
+    if args.profile:
+        profiler.report(args.profile, file=sys.stderr if args.stream == "stdout" else sys.stdout)
+
+    if not saved:
+        return None
+    print(f"Podcast audio saved to {audio_path}")
+    if args.video:
+        from visualize import write_video
+        print(f"Podcast video saved to {write_video(audio_path, style=args.video)}")
+    return audio_path
+
+
+def _dispatch(args, renderer, jobs, audio_path):
+    if args.stream:
+        from streaming import GrowingWavSink, StdoutPCMSink, play, stream_chunks
+        if args.server:
+            chunks = renderer.stream_chunks(jobs)
+        else:
+            chunks = stream_chunks(renderer, jobs)
+        if args.stream == "stdout":
+            play(chunks, StdoutPCMSink())
+            return False
+        play(chunks, GrowingWavSink(audio_path))
+    elif args.incremental:
+        from manifest import render_incremental
+        render_incremental(renderer, jobs, audio_path)
+    elif args.buffer_dir:
+        renderer.render_to_buffer(jobs, args.buffer_dir).export(audio_path)
+    else:
+        renderer.render(jobs, audio_path)
+    return True
@@ -0,0 +1,373 @@
+"""
+Asyncio scheduler: many episode renders on one warm model.
+
+Rendering the EN/JP variants of a script used to mean one blocking process
+(and one model copy) per episode. Here episodes are submitted to a single
+event loop, split into segment slices (``batch_size`` segments each) and
+fed to one shared Renderer through a one-thread executor, since
+generate_custom_voice must not run concurrently on the same model.
+
+- Preview episodes go before bulk renders; after ``BULK_EVERY`` preview
+  slices in a row one bulk slice is let through so bulk never starves.
+- Episodes of the same priority take turns slice by slice (round-robin), so
+  a long render does not hold up a short one submitted after it.
+- Every episode reports progress (segments done / total) and can be
+  cancelled; a slice already on the model finishes, nothing after it runs.
+
+Render several scripts at once, or measure a synthetic mixed load
+(priority scheduling against one-episode-after-another FIFO):
+
+    python scheduler.py pod_nomura_en pod_nomura_jp pod_nomura_jp1
+    python scheduler.py episodes/*.yaml
+    python scheduler.py --load 12 --arrival-seconds 5
+"""
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import soundfile as sf
+
+from assembly import assemble
+from episode_spec import is_spec, load_episode, load_plan
+from renderer import OUTPUT_DIR, PRECISIONS, RenderOptions, Renderer, plan_segments
+
+logger = logging.getLogger("scheduler")
+
+# =============================
+# CONFIG
+# =============================
+PRIORITIES = ("preview", "bulk")
+POLICIES = ("priority", "fifo")
+BULK_EVERY = 4
+PREVIEW_SEGMENTS = 3
+
+
+@dataclass
+class Episode:
+    name: str
+    jobs: list
+    priority: str = "bulk"
+    output_path: str = None
+    status: str = "queued"  # queued, running, done, cancelled, failed
+    done: int = 0
+    audio_seconds: float = 0.0
+    submitted: float = None
+    started: float = None
+    finished: float = None
+    # Resolves to output_path (or ``(audio, sample_rate)`` without one).
+    result: asyncio.Future = field(default=None, repr=False)
+    _next: int = field(default=0, repr=False)
+    _wavs: dict = field(default_factory=dict, repr=False)
+    _sample_rate: int = field(default=None, repr=False)
+
+    @property
+    def total(self):
+        return len(self.jobs)
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+
+def log_progress(episode):
+    logger.info("%s [%s]: %d/%d segments, %.1fs audio",
+                episode.name, episode.priority, episode.done, episode.total, episode.audio_seconds)
+
+
+class Scheduler:
+    """
+    Use as ``async with Scheduler(renderer) as scheduler:``; ``submit``
+    returns an Episode whose ``result`` future can be awaited.
+    """
+
+    def __init__(self, renderer, policy="priority", on_progress=log_progress):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, expected one of {POLICIES}")
+        self.renderer = renderer
+        self.policy = policy
+        self.on_progress = on_progress
+        self._queues = {priority: deque() for priority in PRIORITIES}
+        self._preview_streak = 0
+        self._wakeup = asyncio.Event()
+        self._executor = None
+        self._worker = None
+        self._writes = set()
+
+    async def __aenter__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-model")
+        self._worker = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+
+    def submit(self, name, jobs, priority="bulk", output_path=None):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}, expected one of {PRIORITIES}")
+        jobs = list(jobs)
+        if len({job.index for job in jobs}) < len(jobs):
+            raise ValueError(f"{name}: job indices must be unique")
+        episode = Episode(name=name, jobs=jobs, priority=priority, output_path=output_path)
+        episode.submitted = time.perf_counter()
+        episode.result = asyncio.get_running_loop().create_future()
+        # FIFO keeps everything in one queue and never rotates it.
+        queue = "bulk" if self.policy == "fifo" else priority
+        self._queues[queue].append(episode)
+        self._wakeup.set()
+        return episode
+
+    def _dequeue(self, episode):
+        for queue in self._queues.values():
+            if episode in queue:
+                queue.remove(episode)
+
+    def cancel(self, episode):
+        """Drop an episode's remaining segments. Returns False if it already finished."""
+        if episode.result.done():
+            return False
+        self._dequeue(episode)
+        episode.status = "cancelled"
+        episode.finished = time.perf_counter()
+        episode._wavs.clear()
+        episode.result.cancel()
+        return True
+
+    async def wait(self, episodes):
+        """Wait for ``episodes``; cancelled ones are skipped, failures raised."""
+        results = await asyncio.gather(*(episode.result for episode in episodes), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def _pick_queue(self):
+        preview, bulk = self._queues["preview"], self._queues["bulk"]
+        if preview and (not bulk or self._preview_streak < BULK_EVERY):
+            self._preview_streak += 1
+            return preview
+        self._preview_streak = 0
+        return bulk
+
+    def _next_slice(self):
+        queue = self._pick_queue()
+        if not queue:
+            return None
+        episode = queue[0]
+        size = max(1, self.renderer.options.batch_size)
+        jobs = episode.jobs[episode._next:episode._next + size]
+        episode._next += len(jobs)
+        if episode._next >= episode.total:
+            queue.popleft()
+        elif self.policy == "priority":
+            queue.rotate(-1)
+        return episode, jobs
+
+    def _fail(self, episode, exc):
+        self._dequeue(episode)
+        episode.status = "failed"
+        episode.finished = time.perf_counter()
+        episode._wavs.clear()
+        if not episode.result.done():
+            episode.result.set_exception(exc)
+        logger.error("%s failed: %s", episode.name, exc)
+
+    def _synthesize(self, jobs):
+        return list(self.renderer.synthesize(jobs))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            picked = self._next_slice()
+            if picked is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            episode, jobs = picked
+            if episode.status == "queued":
+                episode.status = "running"
+                episode.started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self._executor, self._synthesize, jobs)
+            except Exception as exc:
+                self._fail(episode, exc)
+                continue
+            if episode.status == "cancelled":
+                continue
+
+            for job, wav, sr in results:
+                episode._wavs[job.index] = wav
+                episode._sample_rate = sr
+                episode.audio_seconds += len(wav) / sr
+            episode.done += len(results)
+            if self.on_progress is not None:
+                self.on_progress(episode)
+            if episode.done == episode.total:
+                write = loop.create_task(self._finish(episode))
+                self._writes.add(write)
+                write.add_done_callback(self._writes.discard)
+
+    async def _finish(self, episode):
+        def write(wavs, pauses, sr):
+            audio, _ = assemble(wavs, pauses, sr)
+            if episode.output_path is None:
+                return audio, sr
+            sf.write(episode.output_path, audio, sr)
+            return episode.output_path
+
+        # Any failure here must still resolve episode.result, or wait() never returns.
+        try:
+            wavs = [episode._wavs.pop(job.index) for job in episode.jobs]
+            pauses = [job.pause for job in episode.jobs]
+            # Assembly and the file write stay off both the loop and the model thread.
+            result = await asyncio.get_running_loop().run_in_executor(
+                None, write, wavs, pauses, episode._sample_rate)
+        except Exception as exc:
+            self._fail(episode, exc)
+            return
+        episode.status = "done"
+        episode.finished = time.perf_counter()
+        if not episode.result.done():
+            episode.result.set_result(result)
+
+
+# =============================
+# RENDER SCRIPTS
+# =============================
+def load_script(script, renderer=None):
+    """
+    Jobs of a pod*.py module or an episode spec file. Specs go through
+    their precompiled render plan (episode_spec.load_plan), so scheduling
+    thousands of them imports no Python and reuses the planned cache keys.
+    """
+    if is_spec(script):
+        plan = load_plan(script, renderer.options if renderer else None)
+        return renderer.use_plan(plan) if renderer else plan.jobs
+    episode = importlib.import_module(script)
+    return plan_segments(episode.PODCAST_SEGMENTS, episode.VOICES, episode.LANGUAGE)
+
+
+def episode_name(script):
+    return os.path.splitext(os.path.basename(script))[0] if is_spec(script) else script
+
+
+def episode_output(script, renderer=None):
+    """The episode's configured filename, as the script (or ``cli.py render``) writes it."""
+    if is_spec(script):
+        return load_plan(script, renderer.options if renderer else None).output
+    return load_episode(script)["output"]
+
+
+async def render_scripts(renderer, scripts, output_dir, previews=()):
+    async with Scheduler(renderer) as scheduler:
+        episodes = [
+            scheduler.submit(episode_name(script), load_script(script, renderer), "bulk",
+                             os.path.join(output_dir, episode_output(script, renderer)))
+            for script in scripts
+        ]
+        episodes += [
+            scheduler.submit(f"{episode_name(script)} preview", load_script(script, renderer)[:PREVIEW_SEGMENTS],
+                             "preview", os.path.join(output_dir, f"{episode_name(script)}_preview.wav"))
+            for script in previews
+        ]
+        return await scheduler.wait(episodes)
+
+
+# =============================
+# SYNTHETIC LOAD
+# =============================
+def synthetic_load(scripts, count, arrival_seconds, preview_share=0.6, seed=0):
+    """
+    ``count`` episodes with exponential inter-arrival times: previews are a
+    few consecutive segments of a random script, bulk jobs a whole script.
+    """
+    rng = random.Random(seed)
+    plans = {script: load_script(script) for script in scripts}
+    load, arrival = [], 0.0
+    for i in range(count):
+        script = rng.choice(scripts)
+        jobs = plans[script]
+        if rng.random() < preview_share:
+            start = rng.randrange(max(1, len(jobs) - PREVIEW_SEGMENTS + 1))
+            load.append((arrival, f"{script}#{i}", jobs[start:start + PREVIEW_SEGMENTS], "preview"))
+        else:
+            load.append((arrival, f"{script}#{i}", jobs, "bulk"))
+        arrival += rng.expovariate(1.0 / arrival_seconds)
+    return load
+
+
+async def run_load(renderer, load, policy):
+    start = time.perf_counter()
+    async with Scheduler(renderer, policy, on_progress=None) as scheduler:
+        episodes = []
+        for arrival, name, jobs, priority in load:
+            await asyncio.sleep(max(0.0, start + arrival - time.perf_counter()))
+            episodes.append(scheduler.submit(name, jobs, priority))
+        await scheduler.wait(episodes)
+    elapsed = time.perf_counter() - start
+
+    stats = {"policy": policy, "seconds": elapsed,
+             "audio_seconds": sum(episode.audio_seconds for episode in episodes)}
+    for priority in PRIORITIES:
+        latencies = sorted(e.finished - e.submitted for e in episodes if e.priority == priority)
+        if latencies:
+            stats[priority] = (sum(latencies) / len(latencies), latencies[int(0.95 * (len(latencies) - 1))])
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render many episodes on one shared model.")
+    parser.add_argument("scripts", nargs="*", default=["pod_nomura_en", "pod_nomura_jp", "pod_nomura_jp1"],
+                        help="pod*.py module names or episode spec files.")
+    parser.add_argument("--preview", nargs="*", default=[],
+                        help=f"Also render the first {PREVIEW_SEGMENTS} segments of these scripts at preview priority.")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--precision", choices=PRECISIONS, default="fp32")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Segments per scheduling slice (and per generate call).")
+    parser.add_argument("--load", type=int, default=None,
+                        help="Instead of rendering, replay this many synthetic mixed jobs under each policy.")
+    parser.add_argument("--arrival-seconds", type=float, default=5.0, help="Mean gap between synthetic jobs.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    renderer = Renderer(RenderOptions(model_path=args.model_path, precision=args.precision,
+                                      batch_size=args.batch_size))
+    renderer.model
+
+    if args.load is None:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for path in asyncio.run(render_scripts(renderer, args.scripts, args.output_dir, args.preview)):
+            print(f"Podcast audio saved to {path}")
+        return
+
+    load = synthetic_load(args.scripts, args.load, args.arrival_seconds, seed=args.seed)
+    previews = sum(1 for *_, priority in load if priority == "preview")
+    print(f"{len(load)} jobs ({previews} preview, {len(load) - previews} bulk), "
+          f"{sum(len(jobs) for _, _, jobs, _ in load)} segments")
+    print(f"{'policy':<10}{'wall s':>9}{'RTF':>8}{'preview mean/p95 s':>22}{'bulk mean/p95 s':>20}")
+    for policy in ("fifo", "priority"):
+        stats = asyncio.run(run_load(renderer, load, policy))
+        cells = [f"{stats[p][0]:.1f} / {stats[p][1]:.1f}" if p in stats else "-" for p in PRIORITIES]
+        print(f"{policy:<10}{stats['seconds']:>9.1f}{stats['audio_seconds'] / stats['seconds']:>8.2f}"
+              f"{cells[0]:>22}{cells[1]:>20}")
+
+
+if __name__ == "__main__":
+    main()
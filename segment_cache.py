@@ -0,0 +1,134 @@
+"""
+Content-addressed on-disk cache of generated segment waveforms.
+
+A segment is keyed on everything that changes its audio: text, speaker,
+instruct, language, sampling parameters and a fingerprint of the model
+checkpoint. Editing one line of an episode therefore only re-runs TTS for
+that line; every other segment is loaded back from ``.npy`` files.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# =============================
+# CONFIG
+# =============================
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+FINGERPRINT_FILES = ("config.json", "generate_config.json", "speech_tokenizer/config.json")
+
+
+def model_fingerprint(model_path):
+    """
+    Cheap checkpoint fingerprint: config contents plus name/size/mtime of the
+    weight files. Hashing gigabytes of safetensors on every run would cost
+    more than the cache saves.
+    """
+    digest = hashlib.sha256()
+    for name in FINGERPRINT_FILES:
+        path = os.path.join(model_path, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+
+    for root, _, files in sorted(os.walk(model_path)):
+        for name in sorted(files):
+            if not name.endswith((".safetensors", ".bin", ".pt")):
+                continue
+            stat = os.stat(os.path.join(root, name))
+            rel = os.path.relpath(os.path.join(root, name), model_path)
+            digest.update(f"{rel}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+class SegmentCache:
+    """
+    Directory of ``<key>.<sample_rate>.npy`` files with size-based LRU eviction.
+
+    Recency is the file mtime, bumped on every hit, so the LRU order survives
+    between runs without a separate index file.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+        self._entries = {}
+        for entry in os.scandir(directory):
+            parts = entry.name.split(".")
+            if len(parts) == 3 and parts[2] == "npy":
+                stat = entry.stat()
+                self._entries[parts[0]] = [entry.path, int(parts[1]), stat.st_size, stat.st_mtime]
+        self._evict()
+
+    @staticmethod
+    def key(job, fingerprint, sampling=None):
+        payload = {
+            "text": job.text,
+            "speaker": job.speaker,
+            "instruct": job.instruct or "",
+            "language": job.language,
+            "sampling": sampling or {},
+            "model": fingerprint,
+        }
+        blob = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(blob).hexdigest()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def size_bytes(self):
+        return sum(entry[2] for entry in self._entries.values())
+
+    def get(self, key):
+        """Return ``(wav, sample_rate)`` or None."""
+        entry = self._entries.get(key)
+        if entry is None or not os.path.exists(entry[0]):
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        wav = np.load(entry[0])
+        os.utime(entry[0])
+        entry[3] = os.path.getmtime(entry[0])
+        self.hits += 1
+        return wav, entry[1]
+
+    def put(self, key, wav, sample_rate):
+        path = os.path.join(self.directory, f"{key}.{sample_rate}.npy")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.asarray(wav, dtype=np.float32))
+        os.replace(tmp, path)
+
+        stat = os.stat(path)
+        self._entries[key] = [path, sample_rate, stat.st_size, stat.st_mtime]
+        self._evict()
+
+    def _evict(self):
+        total = self.size_bytes
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1][3]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry[0])
+            except FileNotFoundError:
+                pass
+            total -= entry[2]
+            del self._entries[key]
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+        }
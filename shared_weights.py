@@ -0,0 +1,250 @@
+"""
+Share one page-cache copy of the weights between concurrent renderers.
+
+``Qwen3TTSModel.from_pretrained(..., device_map="cpu")`` copies every weight
+into private process memory. With several scripts rendering at once, the
+host holds one full copy per process. ``--share-weights`` loads the model
+as usual, then points every parameter and buffer at a memory map of the
+checkpoint's safetensors files and frees the private copies. The mapped
+pages live in the page cache once per host, however many processes map
+them.
+
+The mapping is copy-on-write (``MAP_PRIVATE``): inference never writes to
+weights, and if something ever did, that page would become private to the
+one process instead of corrupting the file. The checkpoint dtype must match
+the loaded dtype. If it does not (e.g. a bf16 checkpoint rendered in fp32),
+the converted weights are written once to ``MMAP_CACHE_DIR`` and that file
+is mapped instead. int8 replaces the talker's Linear layers with quantized
+copies, so there is nothing left to share.
+
+RSS counts shared pages in every process that touches them, so it hardly
+moves; PSS (shared pages split between their users) and the host's used
+memory show the saving. Compare private vs shared with 1, 4 and 8
+concurrent renderers:
+
+    python shared_weights.py --renderers 1 4 8
+"""
+import argparse
+import ctypes
+import gc
+import json
+import logging
+import mmap
+import multiprocessing as mp
+import os
+import struct
+import time
+import warnings
+
+logger = logging.getLogger("shared_weights")
+
+# =============================
+# CONFIG
+# =============================
+MMAP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "qwen3tts", "mmap")
+# safetensors dtype tag -> torch dtype attribute.
+DTYPES = {
+    "F64": "float64", "F32": "float32", "F16": "float16", "BF16": "bfloat16",
+    "I64": "int64", "I32": "int32", "I16": "int16", "I8": "int8", "U8": "uint8", "BOOL": "bool",
+}
+TAGS = {name: tag for tag, name in DTYPES.items()}
+
+
+# =============================
+# SAFETENSORS FILES
+# =============================
+def read_header(path):
+    """``(header, data_start)``: the JSON header (without ``__metadata__``) and where tensor data begins."""
+    with open(path, "rb") as f:
+        size, = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(size))
+    header.pop("__metadata__", None)
+    return header, 8 + size
+
+
+def checkpoint_files(directory):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".safetensors"))
+
+
+def map_file(path):
+    """``{name: tensor}`` backed by a copy-on-write mmap of ``path`` (no data is read up front)."""
+    import torch
+
+    header, start = read_header(path)
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    tensors = {}
+    for name, info in header.items():
+        dtype = getattr(torch, DTYPES[info["dtype"]])
+        begin, end = info["data_offsets"]
+        count = (end - begin) // dtype.itemsize
+        tensor = torch.frombuffer(mapped, dtype=dtype, count=count, offset=start + begin) if count else \
+            torch.empty(0, dtype=dtype)
+        tensors[name] = tensor.view(info["shape"])
+    return tensors
+
+
+def convert_file(source, target, dtype):
+    """Write ``source`` with floating-point tensors cast to ``dtype``, one tensor at a time."""
+    import torch
+
+    header, _ = read_header(source)
+    tensors = map_file(source)
+    out_header, offset = {}, 0
+    for name, info in header.items():
+        tensor = tensors[name]
+        if tensor.is_floating_point():
+            info = dict(info, dtype=TAGS[str(dtype).replace("torch.", "")])
+        size = tensor.numel() * getattr(torch, DTYPES[info["dtype"]]).itemsize
+        out_header[name] = dict(info, data_offsets=[offset, offset + size])
+        offset += size
+    encoded = json.dumps(out_header).encode()
+    encoded += b" " * (-len(encoded) % 8)
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(struct.pack("<Q", len(encoded)) + encoded)
+        for name in out_header:
+            tensor = tensors[name]
+            if tensor.is_floating_point():
+                tensor = tensor.to(dtype)
+            f.write(tensor.contiguous().view(torch.uint8).numpy())
+    os.replace(tmp, target)
+
+
+def mapped_checkpoint(directory, dtype, cache_dir=MMAP_CACHE_DIR):
+    """The safetensors files to map for ``dtype``: the checkpoint's own, or converted copies."""
+    from segment_cache import model_fingerprint
+
+    tag = TAGS[str(dtype).replace("torch.", "")]
+    paths = []
+    for path in checkpoint_files(directory):
+        header, _ = read_header(path)
+        if all(info["dtype"] == tag for info in header.values() if info["dtype"] in ("F32", "F16", "BF16")):
+            paths.append(path)
+            continue
+        target = os.path.join(cache_dir, f"{model_fingerprint(directory)}-{DTYPES[tag]}",
+                              os.path.basename(path))
+        if not os.path.isfile(target):
+            start = time.perf_counter()
+            convert_file(path, target, dtype)
+            logger.info("Converted %s to %s for mapping in %.1fs", path, DTYPES[tag], time.perf_counter() - start)
+        paths.append(target)
+    return paths
+
+
+# =============================
+# SHARE
+# =============================
+def share_module(module, directory, cache_dir=MMAP_CACHE_DIR):
+    """
+    Re-point ``module``'s parameters and buffers at the mapped checkpoint in
+    ``directory``. Returns ``(shared_bytes, private_bytes)``; tensors with no
+    matching name, shape and dtype in the checkpoint stay private.
+    """
+    dtype = next(module.parameters()).dtype
+    mapped = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # frombuffer warns about sharing the mmap's memory
+        for path in mapped_checkpoint(directory, dtype, cache_dir):
+            mapped.update(map_file(path))
+
+    # Tied weights appear under several names; any of them may be the one saved.
+    names = {}
+    for name, tensor in list(module.named_parameters(remove_duplicate=False)) + list(module.named_buffers()):
+        names.setdefault(id(tensor), (tensor, []))[1].append(name)
+
+    shared = private = 0
+    for tensor, aliases in names.values():
+        sources = [mapped[name] for name in aliases if name in mapped]
+        source = next((s for s in sources if s.shape == tensor.shape and s.dtype == tensor.dtype), None)
+        if source is not None:
+            tensor.data = source
+            shared += tensor.numel() * tensor.element_size()
+        else:
+            private += tensor.numel() * tensor.element_size()
+    return shared, private
+
+
+def share_weights(model, model_path, cache_dir=MMAP_CACHE_DIR):
+    """Map the LM and codec weights of a loaded Qwen3TTSModel; logs and returns the byte counts."""
+    shared, private = share_module(model.model, model_path, cache_dir)
+    codec_dir = os.path.join(model_path, "speech_tokenizer")
+    if os.path.isdir(codec_dir):
+        codec = share_module(model.model.speech_tokenizer.model, codec_dir, cache_dir)
+        shared, private = shared + codec[0], private + codec[1]
+    gc.collect()
+    try:
+        # Hand the freed private copies back to the OS now rather than at glibc's convenience.
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    model._shared_weights = (shared, private)
+    logger.info("Weights mapped from %s: %.0f MB shared, %.0f MB private",
+                model_path, shared / 1024 ** 2, private / 1024 ** 2)
+    return shared, private
+
+
+# =============================
+# MEASURE
+# =============================
+def _renderer_process(options, reports, release):
+    import psutil
+
+    from renderer import Renderer, SegmentJob
+
+    renderer = Renderer(options)
+    job = SegmentJob(index=0, role="host", text="Welcome back to the show.", speaker="Ryan", language="English")
+    for _ in renderer.synthesize([job]):
+        pass
+    info = psutil.Process().memory_full_info()
+    reports.put({"rss": info.rss, "pss": info.pss, "uss": info.uss})
+    release.wait()
+
+
+def measure(options, count):
+    """Start ``count`` renderers at once; per-process RSS/PSS/USS and the host memory they added."""
+    import psutil
+
+    context = mp.get_context("spawn")
+    reports, release = context.Queue(), context.Event()
+    gc.collect()
+    before = psutil.virtual_memory().used
+    processes = [context.Process(target=_renderer_process, args=(options, reports, release)) for _ in range(count)]
+    for process in processes:
+        process.start()
+    rows = [reports.get() for _ in processes]
+    host = psutil.virtual_memory().used - before
+    release.set()
+    for process in processes:
+        process.join()
+    return rows, host
+
+
+def main(argv=None):
+    from dataclasses import replace
+
+    from renderer import PRECISIONS, RenderOptions
+
+    parser = argparse.ArgumentParser(description="Private vs memory-mapped weights with concurrent renderers.")
+    parser.add_argument("--renderers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--precision", choices=[p for p in PRECISIONS if p != "int8"], default="fp32")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    base = RenderOptions(model_path=args.model_path, precision=args.precision, normalize=False)
+    print(f"{'weights':<9}{'renderers':>10}{'RSS/proc MB':>13}{'USS/proc MB':>13}{'PSS total MB':>14}"
+          f"{'host +MB':>10}")
+    for share in (False, True):
+        for count in args.renderers:
+            rows, host = measure(replace(base, share_weights=share), count)
+            mb = 1024 ** 2
+            print(f"{'shared' if share else 'private':<9}{count:>10}"
+                  f"{sum(r['rss'] for r in rows) / count / mb:>13.0f}{sum(r['uss'] for r in rows) / count / mb:>13.0f}"
+                  f"{sum(r['pss'] for r in rows) / mb:>14.0f}{host / mb:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Real-time preview: hear the episode while later segments are still generating.
+
+Generation runs in a background thread and feeds a bounded queue; the caller
+drains it into a sink (a growing WAV file, raw PCM on stdout, or a chunked
+HTTP response in tts_server.py). Time-to-first-audio is the metric that
+matters for previews and is reported for every run.
+
+qwen_tts 0.0.5 only returns a segment once it is fully decoded, so the
+earliest audio is the end of the first segment; chunks below that just keep
+sink writes small and steady.
+
+    python pod.py --stream stdout | ffplay -f s16le -ar 24000 -ac 1 -nodisp -
+"""
+import logging
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger("streaming")
+
+# =============================
+# CONFIG
+# =============================
+CHUNK_SECONDS = 0.5
+QUEUE_CHUNKS = 64
+
+_DONE = object()
+
+
+def to_pcm16(chunk):
+    return (np.clip(chunk, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def from_pcm16(data):
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32767
+
+
+def stream_chunks(renderer, jobs, chunk_seconds=CHUNK_SECONDS, max_queue=QUEUE_CHUNKS):
+    """
+    Yield ``(job, chunk, sample_rate)`` in script order, pauses included as
+    silent chunks, while ``renderer.synthesize`` keeps running in a thread.
+    """
+    chunks = queue.Queue(maxsize=max_queue)
+    stop = threading.Event()
+
+    def put(item):
+        # Give up once the consumer has gone away instead of blocking forever.
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for job, wav, sr in renderer.synthesize(jobs):
+                step = max(1, int(sr * chunk_seconds))
+                for start in range(0, len(wav), step):
+                    if not put((job, wav[start:start + step], sr)):
+                        return
+                if job.pause:
+                    if not put((job, np.zeros(int(sr * job.pause), dtype=np.float32), sr)):
+                        return
+            put(_DONE)
+        except BaseException as exc:
+            put(exc)
+
+    producer = threading.Thread(target=produce, name="tts-producer", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+# =============================
+# SINKS
+# =============================
+class StdoutPCMSink:
+    """Raw 16-bit little-endian mono PCM for piping into ffplay/aplay."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout.buffer
+
+    def write(self, chunk, sample_rate):
+        self.stream.write(to_pcm16(chunk))
+        self.stream.flush()
+
+    def close(self):
+        self.stream.flush()
+
+
+class GrowingWavSink:
+    """WAV file whose header is synced after every chunk so players can tail it."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def write(self, chunk, sample_rate):
+        if self._file is None:
+            self._file = sf.SoundFile(self.path, "w", samplerate=sample_rate, channels=1)
+        self._file.write(chunk)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def play(chunks, sink):
+    """
+    Drain ``(job, chunk, sample_rate)`` items (``stream_chunks`` or
+    ``RemoteRenderer.stream_chunks``) into ``sink``; returns timing metrics.
+    """
+    start = time.perf_counter()
+    ttfa = None
+    audio_seconds = 0.0
+    try:
+        for _, chunk, sr in chunks:
+            sink.write(chunk, sr)
+            if ttfa is None:
+                ttfa = time.perf_counter() - start
+                logger.info("Time to first audio: %.2fs", ttfa)
+            audio_seconds += len(chunk) / sr
+    finally:
+        sink.close()
+
+    total = time.perf_counter() - start
+    logger.info("Streamed %.1fs of audio in %.1fs", audio_seconds, total)
+    return {"ttfa_seconds": ttfa, "total_seconds": total, "audio_seconds": audio_seconds}
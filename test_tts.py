@@ -1,20 +1,14 @@
-import torch
-import soundfile as sf
-from qwen_tts import Qwen3TTSModel
-from local_config import MODEL_PATH
+from renderer import run_episode
 
-model = Qwen3TTSModel.from_pretrained(
-    MODEL_PATH,
-    device_map="cpu",
-    dtype=torch.float32
-)
+SEGMENTS = [
+    {
+        "role": "host",
+        "instruct": "speak fast",
+        "text": "Hello. Qwen text to speech is finally working.",
+    }
+]
 
-wavs, sr = model.generate_custom_voice(
-    text="Hello. Qwen text to speech is finally working.",
-    language="English",
-    speaker="Ryan",
-    instruct="speak fast"
-)
+VOICES = {"host": {"speaker": "Ryan"}}
 
-sf.write("output.wav", wavs[0], sr)
-print("Saved output.wav")
+if __name__ == "__main__":
+    run_episode(SEGMENTS, VOICES, language="English", filename="output.wav", output_dir=".")
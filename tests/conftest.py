@@ -0,0 +1,34 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_RATE = 24000
+
+
+def fake_wav(text):
+    """A constant tone whose length and level depend on ``text``."""
+    level = (sum(map(ord, text)) % 97 + 1) / 200
+    return np.full(40 * len(text), level, dtype=np.float32)
+
+
+class FakeModel:
+    """Stands in for Qwen3TTSModel and records every text it was asked to speak."""
+
+    def __init__(self):
+        self.generated = []
+
+    def generate_custom_voice(self, text, language, speaker, instruct=None, **kwargs):
+        texts = text if isinstance(text, list) else [text]
+        self.generated.extend(texts)
+        return [fake_wav(t) for t in texts], SAMPLE_RATE
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    from renderer import RenderOptions, Renderer
+
+    return Renderer(RenderOptions(model_path=str(tmp_path), normalize=False), model=FakeModel())
@@ -0,0 +1,41 @@
+import soundfile as sf
+
+from renderer import plan_segments
+
+VOICES = {"host": {"speaker": "Ryan", "pause": 0.1}, "guest": {"speaker": "Aiden"}}
+
+
+def jobs_for(texts):
+    return plan_segments([{"role": "host" if i % 2 == 0 else "guest", "text": text}
+                          for i, text in enumerate(texts)], VOICES, "English")
+
+
+def render(renderer, texts, directory, path):
+    renderer.model.generated.clear()
+    renderer.render_to_buffer(jobs_for(texts), str(directory)).export(str(path))
+    return list(renderer.model.generated)
+
+
+def test_buffer_resumes_an_interrupted_render(renderer, tmp_path):
+    texts = ["Welcome back.", "Thanks for having me.", "Let's begin.", "Sure thing."]
+    render(renderer, texts[:2], tmp_path / "buffer", tmp_path / "partial.wav")
+    assert render(renderer, texts, tmp_path / "buffer", tmp_path / "episode.wav") == texts[2:]
+
+    render(renderer, texts, tmp_path / "fresh", tmp_path / "fresh.wav")
+    assert (sf.read(tmp_path / "episode.wav")[0] == sf.read(tmp_path / "fresh.wav")[0]).all()
+
+
+def test_buffer_does_not_reuse_another_episode(renderer, tmp_path):
+    render(renderer, ["Episode one.", "First guest line."], tmp_path / "buffer", tmp_path / "one.wav")
+    other = ["Episode two.", "Second guest line."]
+    assert render(renderer, other, tmp_path / "buffer", tmp_path / "two.wav") == other
+
+    render(renderer, other, tmp_path / "fresh", tmp_path / "fresh.wav")
+    assert (sf.read(tmp_path / "two.wav")[0] == sf.read(tmp_path / "fresh.wav")[0]).all()
+
+
+def test_buffer_rerenders_from_the_first_edit(renderer, tmp_path):
+    texts = ["Welcome back.", "Thanks for having me.", "Let's begin.", "Sure thing."]
+    render(renderer, texts, tmp_path / "buffer", tmp_path / "episode.wav")
+    edited = texts[:1] + ["Thanks for inviting me."] + texts[2:]
+    assert render(renderer, edited, tmp_path / "buffer", tmp_path / "episode.wav") == edited[1:]
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from episode_spec import RenderPlan, SpecError, compile_plan, load_episode, load_spec, validate
+from renderer import RenderOptions
+
+
+def spec(**overrides):
+    data = {
+        "language": "English",
+        "voices": {"host": {"speaker": "Ryan", "pause": 0.3}, "guest": {"speaker": "Aiden"}},
+        "segments": [
+            {"role": "host", "text": "Welcome back to the show."},
+            {"role": "guest", "text": "Thanks for having me.", "pause": 0.5},
+        ],
+    }
+    data.update(overrides)
+    return data
+
+
+def problems(data):
+    with pytest.raises(SpecError) as error:
+        validate(data, "episode.yaml")
+    return error.value.problems
+
+
+def test_valid_spec_gets_default_output():
+    assert validate(spec(), "episodes/show.yaml")["output"] == "show.wav"
+
+
+def test_every_problem_is_reported_with_its_location():
+    data = spec(title=3, extra=True)
+    data["voices"]["guest"] = {"instruct": "calm"}
+    data["segments"] += [
+        {"role": "nobody", "text": "Hello."},
+        {"role": "host", "text": "  ", "pause": -1},
+        {"text": "No role."},
+    ]
+    found = problems(data)
+    assert "spec.title: expected str, got int" in found
+    assert any(p.startswith("spec: unknown key 'extra'") for p in found)
+    assert "voices.guest: missing 'speaker'" in found
+    assert "segments[2].role: 'nobody' has no voice (have host, guest)" in found
+    assert "segments[3].text: empty" in found
+    assert "segments[3].pause: must be >= 0, got -1" in found
+    assert "segments[4]: missing 'role'" in found
+
+
+def test_non_string_role_is_a_spec_error():
+    data = spec()
+    data["segments"][0]["role"] = ["host"]
+    assert problems(data) == ["segments[0].role: expected str, got list"]
+
+
+def test_missing_sections():
+    assert problems({"voices": {}, "segments": []}) == [
+        "spec: missing 'language'", "voices: no roles defined", "segments: empty",
+    ]
+
+
+@pytest.mark.parametrize("suffix", [".yaml", ".json"])
+def test_load_spec_from_file(tmp_path, suffix):
+    path = tmp_path / f"show{suffix}"
+    if suffix == ".json":
+        path.write_text(json.dumps(spec()), encoding="utf-8")
+    else:
+        import yaml
+        path.write_text(yaml.safe_dump(spec(), allow_unicode=True), encoding="utf-8")
+    assert load_spec(str(path)) == dict(spec(), output="show.wav")
+    assert load_episode(str(path)) == load_spec(str(path))
+
+
+def test_compile_plan_round_trips(tmp_path):
+    options = RenderOptions(model_path=str(tmp_path), batch_size=2)
+    plan = compile_plan(validate(spec(), "show.yaml"), options, "show")
+    assert [job.pause for job in plan.jobs] == [0.3, 0.5]
+    assert sorted(index for batch in plan.batches for index in batch) == [0, 1]
+    assert RenderPlan.from_dict(json.loads(json.dumps(plan.to_dict()))) == plan
@@ -0,0 +1,13 @@
+import pytest
+
+from frontend import normalize_text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Exactly. FY2024/25 showed results.", "Exactly. Fiscal year 2024 to 2025 showed results."),
+    ("FY2024 was good.", "Fiscal year 2024 was good."),
+    ("Growth in FY2024/25 was broad.", "Growth in fiscal year 2024 to 2025 was broad."),
+    ("ROE of 8-10%", "ROE of 8 to 10 percent"),
+])
+def test_english_rules_keep_sentence_capitals(text, expected):
+    assert normalize_text(text, "English") == expected
@@ -0,0 +1,26 @@
+import pytest
+
+from tts_server import parse_request
+
+JOB = {"index": 0, "role": "host", "text": "Welcome back.", "speaker": "Ryan", "language": "English"}
+
+
+def test_parse_request_builds_jobs_and_options():
+    jobs, options = parse_request({"jobs": [JOB], "batch_size": 2, "tempo": 1.1})
+    assert [job.text for job in jobs] == ["Welcome back."]
+    assert (options.batch_size, options.tempo) == (2, 1.1)
+
+
+@pytest.mark.parametrize("payload, message", [
+    ([], "JSON object"),
+    ({}, "non-empty list"),
+    ({"jobs": []}, "non-empty list"),
+    ({"jobs": [{"text": "No voice."}]}, "jobs[0]"),
+    ({"jobs": [dict(JOB, text=" ")]}, "empty text"),
+    ({"jobs": [JOB, JOB]}, "unique"),
+    ({"jobs": [JOB], "batch_size": 0}, "batch_size"),
+    ({"jobs": [JOB], "tempo": "fast"}, "tempo"),
+])
+def test_parse_request_rejects_malformed_payloads(payload, message):
+    with pytest.raises(ValueError, match=message.replace("[", r"\[")):
+        parse_request(payload)
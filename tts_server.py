@@ -0,0 +1,204 @@
+"""
+Long-lived model server so scripts stop paying from_pretrained on every run.
+
+Start it once (a local Unix socket by default, no network needed):
+
+    python tts_server.py
+    python tts_server.py --host 127.0.0.1 --port 8000
+
+then render through it from any script:
+
+    python pod_nomura_en.py --server unix:/tmp/qwen3tts.sock
+    python pod_nomura_en.py --server http://127.0.0.1:8000
+"""
+import argparse
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+
+import soundfile as sf
+
+from renderer import PRECISIONS, RenderOptions, Renderer, SegmentJob, load_model
+
+logger = logging.getLogger("tts_server")
+
+# =============================
+# CONFIG
+# =============================
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "qwen3tts.sock")
+REQUEST_TIMEOUT = 3600.0
+# RenderOptions a client forwards with each request; the rest are server-side.
+REMOTE_OPTIONS = ("batch_size", "normalize", "tempo", "tempo_method", "split_sentences", "sampling")
+
+
+# =============================
+# SERVER
+# =============================
+def request_options(payload):
+    return RenderOptions(**{name: payload[name] for name in REMOTE_OPTIONS if name in payload})
+
+
+def parse_request(payload):
+    """``(jobs, options)`` from a request body; ValueError (sent back as 422) if it is malformed."""
+    if not isinstance(payload, dict):
+        raise ValueError("body must be a JSON object")
+    jobs = payload.get("jobs")
+    if not isinstance(jobs, list) or not jobs:
+        raise ValueError("'jobs' must be a non-empty list")
+    parsed = []
+    for position, job in enumerate(jobs):
+        try:
+            parsed.append(SegmentJob(**job))
+        except TypeError as exc:
+            raise ValueError(f"jobs[{position}]: {exc}") from None
+        if not isinstance(parsed[-1].text, str) or not parsed[-1].text.strip():
+            raise ValueError(f"jobs[{position}]: empty text")
+    if len({job.index for job in parsed}) < len(parsed):
+        raise ValueError("job indices must be unique")
+    options = request_options(payload)
+    if not isinstance(options.batch_size, int) or options.batch_size < 1:
+        raise ValueError("'batch_size' must be a positive integer")
+    if not isinstance(options.tempo, (int, float)) or options.tempo <= 0:
+        raise ValueError("'tempo' must be a positive number")
+    return parsed, options
+
+
+def create_app(model):
+    from fastapi import Body, FastAPI, HTTPException
+    from fastapi.responses import Response, StreamingResponse
+
+    from streaming import stream_chunks, to_pcm16
+
+    def parse(payload):
+        try:
+            return parse_request(payload)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from None
+
+    app = FastAPI(title="Qwen3 TTS renderer")
+    # generate_custom_voice is not safe to call from two threads at once.
+    lock = threading.Lock()
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.post("/render")
+    def render(payload: dict = Body(...)):
+        jobs, options = parse(payload)
+
+        start = time.perf_counter()
+        with lock:
+            audio, sr, _ = Renderer(options, model=model).render_array(jobs)
+        logger.info("Rendered %d segments in %.1fs", len(jobs), time.perf_counter() - start)
+
+        buf = io.BytesIO()
+        sf.write(buf, audio, sr, format="WAV")
+        return Response(content=buf.getvalue(), media_type="audio/wav")
+
+    @app.post("/stream")
+    def stream(payload: dict = Body(...)):
+        """Chunked raw PCM (s16le, mono) sent while later segments generate."""
+        jobs, options = parse(payload)
+
+        def chunks():
+            with lock:
+                yield from stream_chunks(Renderer(options, model=model), jobs)
+
+        # Pull the first chunk before responding so the sample rate can go
+        # in the headers; the rest streams as it is generated.
+        source = chunks()
+        _, first, sr = next(source)
+
+        def body():
+            yield to_pcm16(first)
+            for _, chunk, _ in source:
+                yield to_pcm16(chunk)
+
+        return StreamingResponse(body(), media_type="audio/L16", headers={"X-Sample-Rate": str(sr)})
+
+    return app
+
+
+# =============================
+# CLIENT
+# =============================
+class RemoteRenderer:
+    """Drop-in for ``Renderer.render`` that posts jobs to a running server."""
+
+    def __init__(self, address, options=None):
+        self.address = address
+        self.options = options or RenderOptions()
+
+    def _client(self):
+        import httpx
+
+        if self.address.startswith("unix:"):
+            transport = httpx.HTTPTransport(uds=self.address[len("unix:"):])
+            return httpx.Client(transport=transport, base_url="http://localhost", timeout=REQUEST_TIMEOUT)
+        return httpx.Client(base_url=self.address, timeout=REQUEST_TIMEOUT)
+
+    def _payload(self, jobs):
+        payload = {name: getattr(self.options, name) for name in REMOTE_OPTIONS}
+        payload["jobs"] = [asdict(job) for job in jobs]
+        return payload
+
+    def stream_chunks(self, jobs):
+        """Yield ``(None, chunk, sample_rate)`` from the server's /stream endpoint."""
+        from streaming import from_pcm16
+
+        with self._client() as client:
+            with client.stream("POST", "/stream", json=self._payload(jobs)) as response:
+                response.raise_for_status()
+                sr = int(response.headers["X-Sample-Rate"])
+                leftover = b""
+                for data in response.iter_bytes():
+                    data = leftover + data
+                    # Keep chunks sample-aligned across network reads.
+                    cut = len(data) - len(data) % 2
+                    leftover = data[cut:]
+                    if cut:
+                        yield None, from_pcm16(data[:cut]), sr
+
+    def render(self, jobs, output_path):
+        with self._client() as client:
+            response = client.post("/render", json=self._payload(jobs))
+            response.raise_for_status()
+
+        with open(output_path, "wb") as f:
+            f.write(response.content)
+        return output_path
+
+
+# =============================
+# ENTRY POINT
+# =============================
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve a warm Qwen3TTSModel.")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--precision", choices=PRECISIONS, default="fp32")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET,
+                        help="Unix socket to listen on (ignored when --port is set).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    app = create_app(load_model(args.model_path, precision=args.precision))
+
+    if args.port is not None:
+        uvicorn.run(app, host=args.host, port=args.port)
+    else:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        uvicorn.run(app, uds=args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Render several language variants of one episode on one loaded model.
+
+The Nomura show exists in English (pod_nomura_en) and Japanese
+(pod_nomura_jp, pod_nomura_jp1), and each script loads the model and
+renders on its own. ``render_variants`` loads the model once and merges
+every variant's segments into one job list with global indices. The
+variants are interleaved segment by segment, so all output files grow
+together. With ``--batch-size`` > 1 the renderer's plan_batches sorts that
+union by estimated duration (a Japanese character takes about twice as
+long to speak as an English one), so one generate call mixes English and
+Japanese lines of similar length instead of padding within a single script.
+Results are routed back to one WavSink per variant.
+
+Render the variants, or also time the scripts one after another (one
+process each, same batch size) for aggregate throughput:
+
+    python variants.py pod_nomura_en pod_nomura_jp pod_nomura_jp1 --batch-size 4
+    python variants.py episodes/pod_nomura_en.yaml episodes/pod_nomura_jp.yaml --batch-size 4 --compare
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import replace
+from itertools import zip_longest
+
+from episode_spec import is_spec, load_episode
+from renderer import OUTPUT_DIR, PRECISIONS, RenderOptions, Renderer, plan_segments
+from wav_sink import WavSink
+
+logger = logging.getLogger("variants")
+
+# =============================
+# CONFIG
+# =============================
+DEFAULT_VARIANTS = ("pod_nomura_en", "pod_nomura_jp", "pod_nomura_jp1")
+
+
+def merge_jobs(variants):
+    """
+    One job list over all ``variants`` (lists of SegmentJobs), re-indexed
+    globally in round-robin order. Returns ``(jobs, routes)`` where
+    ``routes[index]`` is the variant a job belongs to.
+    """
+    jobs, routes = [], {}
+    for group in zip_longest(*variants):
+        for variant, job in enumerate(group):
+            if job is not None:
+                routes[len(jobs)] = variant
+                jobs.append(replace(job, index=len(jobs)))
+    return jobs, routes
+
+
+def render_variants(renderer, sources, output_dir=OUTPUT_DIR):
+    """
+    Render every source (spec file or pod*.py module) in one pass. Returns
+    per-variant stats and the job index -> variant routes.
+    """
+    specs = [load_episode(source) for source in sources]
+    jobs, routes = merge_jobs([plan_segments(spec["segments"], spec["voices"], spec["language"])
+                               for spec in specs])
+    outputs = [spec["output"] for spec in specs]
+    if len(set(outputs)) < len(outputs):
+        raise ValueError(f"variants must write different files, got {', '.join(outputs)}")
+    stats = [{"source": source, "path": os.path.join(output_dir, spec["output"]), "segments": 0,
+              "audio_seconds": 0.0} for source, spec in zip(sources, specs)]
+
+    os.makedirs(output_dir, exist_ok=True)
+    with ExitStack() as stack:
+        sinks = [stack.enter_context(WavSink(row["path"])) for row in stats]
+        for job, wav, sr in renderer.synthesize(jobs):
+            variant = routes[job.index]
+            sinks[variant].append(job.index, wav, sr, pause=job.pause)
+            stats[variant]["segments"] += 1
+            stats[variant]["audio_seconds"] += len(wav) / sr + job.pause
+    return stats, routes
+
+
+# =============================
+# COMPARE
+# =============================
+def run_back_to_back(sources, args, output_dir):
+    """Wall seconds of rendering each source in its own process, one after another."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    flags = ["--output-dir", output_dir, "--precision", args.precision, "--batch-size", str(args.batch_size)]
+    if args.model_path:
+        flags += ["--model-path", args.model_path]
+    seconds = []
+    for source in sources:
+        command = [os.path.join(here, "cli.py"), "render", source] if is_spec(source) else \
+            [os.path.join(here, f"{source}.py")]
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + command + flags, check=True, stdout=subprocess.DEVNULL)
+        seconds.append(time.perf_counter() - start)
+        logger.info("%s on its own: %.1fs", source, seconds[-1])
+    return seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render language variants of one episode on one model.")
+    parser.add_argument("variants", nargs="*", default=list(DEFAULT_VARIANTS),
+                        help="pod*.py module names or episode spec files.")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--precision", choices=PRECISIONS, default="fp32")
+    parser.add_argument("--batch-size", type=int, default=4, help="Segments per shared generate call.")
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--compare", action="store_true",
+                        help="Also run the variants back to back as separate scripts and compare throughput.")
+    args = parser.parse_args(argv)
+    if args.compare and args.cache_dir:
+        parser.error("--compare needs every segment generated; drop --cache-dir")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    options = RenderOptions(model_path=args.model_path, precision=args.precision,
+                            output_dir=args.output_dir, batch_size=args.batch_size, cache_dir=args.cache_dir)
+    start = time.perf_counter()
+    renderer = Renderer(options)
+    stats, routes = render_variants(renderer, args.variants, args.output_dir)
+    shared = time.perf_counter() - start
+
+    audio = sum(row["audio_seconds"] for row in stats)
+    for row in stats:
+        print(f"{row['source']}: {row['segments']} segments, {row['audio_seconds']:.1f}s -> {row['path']}")
+    if renderer.batch_reports:
+        mixed = sum(len({routes[index] for index in report["segments"]}) > 1 for report in renderer.batch_reports)
+        padding = sum(report["audio_padding"] for report in renderer.batch_reports) / len(renderer.batch_reports)
+        print(f"{len(renderer.batch_reports)} shared batches ({mixed} mixing variants), "
+              f"mean audio padding {100 * padding:.0f}%")
+    print(f"one model, shared batches: {audio:.1f}s audio in {shared:.1f}s ({audio / shared:.2f}x real time)")
+
+    if args.compare:
+        with tempfile.TemporaryDirectory() as scratch:
+            seconds = run_back_to_back(args.variants, args, scratch)
+        serial = sum(seconds)
+        print(f"scripts back to back: {audio:.1f}s audio in {serial:.1f}s ({audio / serial:.2f}x real time)")
+        print(f"speedup {serial / shared:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
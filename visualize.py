@@ -0,0 +1,289 @@
+"""
+Waveform / spectrum video for an episode WAV, rasterized in NumPy.
+
+Drawing one matplotlib figure per video frame costs tens of milliseconds a
+frame, i.e. longer than the episode itself at 30 fps. Instead the WAV is
+read once, in blocks of ``FRAME_BLOCK`` frames (memory stays flat for
+multi-hour episodes):
+
+- ``waveform``: min/max envelope of the half second around each frame, one
+  value pair per pixel column, from a single reshape + reduce per block,
+- ``spectrum``: one windowed rFFT per frame for the whole block, pooled into
+  ``BARS`` log-spaced bands.
+
+Frames are painted straight into uint8 arrays by broadcasting the
+envelopes against the pixel rows: a small label image per frame, turned
+into pixels with one ``np.take`` on a packed RGBX palette (ffmpeg reads
+``rgb0`` as is). A generator streams them to ffmpeg's stdin
+(or to a moviepy VideoClip), so no frame list is ever built. The episode
+scripts write the video with ``--video [waveform|spectrum]``.
+
+Frames/sec against a matplotlib figure per frame, optionally plus encoding:
+
+    python visualize.py podcast_output/podcast_jp.wav
+    python visualize.py podcast_output/podcast_jp.wav --style spectrum --output /tmp/preview.mp4
+"""
+import argparse
+import math
+import os
+import subprocess
+import time
+
+import numpy as np
+
+# =============================
+# CONFIG
+# =============================
+STYLES = ("waveform", "spectrum")
+FPS = 30
+SIZE = (1280, 720)
+FRAME_BLOCK = 16
+WAVE_SECONDS = 0.5
+N_FFT = 2048
+BARS = 64
+MIN_HZ = 40.0
+DB_RANGE = 60.0
+PROGRESS_HEIGHT = 6
+# Background, waveform/bars, progress bar.
+PALETTE = np.array([(16, 18, 27), (94, 200, 235), (235, 160, 60)], dtype=np.uint8)
+# The same colours as one uint32 per pixel (bytes R, G, B, 0).
+PACKED = np.pad(PALETTE, ((0, 0), (0, 1))).view(np.uint32).ravel()
+
+
+# =============================
+# FEATURES
+# =============================
+def _frame_windows(path, fps, window, seconds=None):
+    """
+    Yield ``(first_frame, total_frames, sample_rate, windows)`` per block,
+    where ``windows`` is (block, window) mono samples centered on each frame.
+    """
+    import soundfile as sf
+
+    with sf.SoundFile(path) as f:
+        sr, length = f.samplerate, f.frames
+        if seconds is not None:
+            length = min(length, int(seconds * sr))
+        hop = sr / fps
+        total = max(1, math.ceil(length / hop))
+        half = window // 2
+        for first in range(0, total, FRAME_BLOCK):
+            centers = ((np.arange(first, min(first + FRAME_BLOCK, total)) + 0.5) * hop).astype(np.int64)
+            lo, hi = centers[0] - half, centers[-1] - half + window
+            f.seek(max(lo, 0))
+            samples = f.read(min(hi, length) - max(lo, 0), dtype="float32", always_2d=True).mean(axis=1)
+            samples = np.pad(samples, (max(-lo, 0), hi - lo - max(-lo, 0) - len(samples)))
+            windows = np.lib.stride_tricks.sliding_window_view(samples, window)[centers - half - lo]
+            yield first, total, sr, windows
+
+
+def waveform_envelopes(path, width, fps=FPS, seconds=None):
+    """Yield ``(first_frame, total_frames, lows, highs)``; lows/highs are (block, width)."""
+    import soundfile as sf
+
+    per_column = max(1, int(WAVE_SECONDS * sf.info(path).samplerate) // width)
+    for first, total, _, windows in _frame_windows(path, fps, per_column * width, seconds):
+        columns = windows.reshape(len(windows), width, per_column)
+        yield first, total, columns.min(axis=2), columns.max(axis=2)
+
+
+def band_edges(sr, bars=BARS, n_fft=N_FFT):
+    """rFFT bin index where each log-spaced band starts (strictly increasing)."""
+    hz = np.geomspace(MIN_HZ, sr / 2, bars + 1)[:-1]
+    edges = np.maximum(np.round(hz * n_fft / sr).astype(np.int64), 1)
+    steps = np.arange(bars)
+    return np.maximum.accumulate(edges - steps) + steps
+
+
+def spectrum_levels(path, bars=BARS, fps=FPS, seconds=None):
+    """Yield ``(first_frame, total_frames, levels)``; levels are (block, bars) in [0, 1]."""
+    window = np.hanning(N_FFT).astype(np.float32)
+    edges = None
+    for first, total, sr, windows in _frame_windows(path, fps, N_FFT, seconds):
+        if edges is None:
+            edges = band_edges(sr, bars)
+        magnitude = np.abs(np.fft.rfft(windows * window, axis=1)) / (N_FFT / 4)
+        pooled = np.maximum.reduceat(magnitude, edges, axis=1)
+        db = 20 * np.log10(pooled + 1e-9)
+        yield first, total, np.clip(1 + db / DB_RANGE, 0.0, 1.0)
+
+
+# =============================
+# RASTERIZE
+# =============================
+def _progress(labels, first, total):
+    """Paint the bottom progress bar (label 2) for each frame of the block."""
+    width = labels.shape[2]
+    done = ((np.arange(first, first + len(labels)) + 1) * width // total)[:, None, None]
+    labels[:, -PROGRESS_HEIGHT:, :] = np.where(np.arange(width)[None, None, :] < done, 2, 0)
+
+
+def _paint(labels):
+    """(block, height, width) labels -> (block, height, width, 4) uint8 RGBX pixels."""
+    return np.take(PACKED, labels).view(np.uint8).reshape(labels.shape + (4,))
+
+
+def draw_waveform(lows, highs, first, total, height):
+    """(block, width) envelopes -> (block, height, width, 4) RGBX frames."""
+    # int16 pixel rows: the comparisons below are the bulk of the work.
+    rows = np.arange(height - PROGRESS_HEIGHT, dtype=np.int16)[None, :, None]
+    middle = (height - PROGRESS_HEIGHT) / 2
+    top = np.floor(middle - 0.9 * middle * highs).astype(np.int16)[:, None, :]
+    bottom = np.ceil(middle - 0.9 * middle * lows).astype(np.int16)[:, None, :]
+    labels = np.zeros((len(lows), height, lows.shape[1]), dtype=np.uint8)
+    labels[:, :-PROGRESS_HEIGHT] = (rows >= top) & (rows <= bottom)
+    _progress(labels, first, total)
+    return _paint(labels)
+
+
+def draw_bars(levels, first, total, height, width):
+    """(block, bars) levels -> (block, height, width, 4) RGBX frames."""
+    bars = levels.shape[1]
+    columns = np.arange(width)
+    band = columns * bars // width
+    is_bar = (columns * bars % width) < 0.8 * width  # leave a gap after each bar
+    area = height - PROGRESS_HEIGHT
+    tops = np.round(area * (1 - levels[:, band])).astype(np.int16)[:, None, :]
+    rows = np.arange(area, dtype=np.int16)[None, :, None]
+    labels = np.zeros((len(levels), height, width), dtype=np.uint8)
+    labels[:, :-PROGRESS_HEIGHT] = (rows >= tops) & is_bar[None, None, :]
+    _progress(labels, first, total)
+    return _paint(labels)
+
+
+def frame_blocks(path, style="waveform", fps=FPS, size=SIZE, seconds=None):
+    """Yield (block, height, width, 4) uint8 RGBX arrays covering the whole WAV at ``fps``."""
+    width, height = size
+    if style == "waveform":
+        for first, total, lows, highs in waveform_envelopes(path, width, fps, seconds):
+            yield draw_waveform(lows, highs, first, total, height)
+    elif style == "spectrum":
+        for first, total, levels in spectrum_levels(path, BARS, fps, seconds):
+            yield draw_bars(levels, first, total, height, width)
+    else:
+        raise ValueError(f"Unknown style {style!r}, expected one of {STYLES}")
+
+
+def frames(path, style="waveform", fps=FPS, size=SIZE, seconds=None):
+    """One (height, width, 3) RGB frame at a time."""
+    for block in frame_blocks(path, style, fps, size, seconds):
+        yield from block[..., :3]
+
+
+# =============================
+# ENCODE
+# =============================
+def _write_ffmpeg(audio_path, video_path, style, fps, size, seconds):
+    import imageio_ffmpeg
+
+    width, height = size
+    command = [
+        imageio_ffmpeg.get_ffmpeg_exe(), "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb0", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+        "-i", audio_path, "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest", video_path,
+    ]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE)
+    try:
+        for block in frame_blocks(audio_path, style, fps, size, seconds):
+            process.stdin.write(block.tobytes())
+    finally:
+        process.stdin.close()
+    if process.wait():
+        raise RuntimeError(f"ffmpeg exited with status {process.returncode}")
+
+
+class _SequentialFrames:
+    """moviepy asks for frames by time; serve them from the generator in order."""
+
+    def __init__(self, source, fps):
+        self.source = source
+        self.fps = fps
+        self.index = -1
+        self.frame = None
+
+    def __call__(self, t):
+        index = int(round(t * self.fps))
+        while self.index < index:
+            self.frame = next(self.source, self.frame)
+            self.index += 1
+        return self.frame
+
+
+def _write_moviepy(audio_path, video_path, style, fps, size, seconds):
+    from moviepy import AudioFileClip, VideoClip
+
+    audio = AudioFileClip(audio_path)
+    duration = audio.duration if seconds is None else min(seconds, audio.duration)
+    source = _SequentialFrames(frames(audio_path, style, fps, size, seconds), fps)
+    clip = VideoClip(frame_function=source, duration=duration).with_audio(audio.subclipped(0, duration))
+    clip.write_videofile(video_path, fps=fps, codec="libx264", audio_codec="aac", logger=None)
+    audio.close()
+
+
+def write_video(audio_path, video_path=None, style="waveform", fps=FPS, size=SIZE, encoder="ffmpeg",
+                seconds=None):
+    """Render ``audio_path`` to an MP4 next to it (or ``video_path``); returns the video path."""
+    video_path = video_path or os.path.splitext(audio_path)[0] + ".mp4"
+    writer = _write_moviepy if encoder == "moviepy" else _write_ffmpeg
+    writer(audio_path, video_path, style, fps, size, seconds)
+    return video_path
+
+
+# =============================
+# BENCHMARK
+# =============================
+def matplotlib_fps(path, frame_count, fps=FPS, size=SIZE):
+    """Frames/sec of the per-frame matplotlib figure approach (new figure, draw, grab RGB)."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import soundfile as sf
+
+    audio, sr = sf.read(path, dtype="float32", always_2d=True)
+    audio = audio.mean(axis=1)
+    hop, half = sr / fps, int(WAVE_SECONDS * sr) // 2
+    start = time.perf_counter()
+    for index in range(frame_count):
+        center = int((index + 0.5) * hop)
+        window = audio[max(center - half, 0):center + half]
+        fig, ax = plt.subplots(figsize=(size[0] / 100, size[1] / 100), dpi=100)
+        ax.plot(window, linewidth=0.5)
+        ax.set_ylim(-1, 1)
+        ax.axis("off")
+        fig.canvas.draw()
+        np.asarray(fig.canvas.buffer_rgba())[..., :3].copy()
+        plt.close(fig)
+    return frame_count / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NumPy video frames vs a matplotlib figure per frame.")
+    parser.add_argument("audio")
+    parser.add_argument("--style", choices=STYLES, default="waveform")
+    parser.add_argument("--fps", type=int, default=FPS)
+    parser.add_argument("--size", type=int, nargs=2, default=SIZE, metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--seconds", type=float, default=30.0, help="How much of the audio to render.")
+    parser.add_argument("--matplotlib-frames", type=int, default=60)
+    parser.add_argument("--output", default=None, help="Also encode this much to a video file.")
+    parser.add_argument("--encoder", choices=("ffmpeg", "moviepy"), default="ffmpeg")
+    args = parser.parse_args(argv)
+    size = tuple(args.size)
+
+    start = time.perf_counter()
+    count = sum(len(block) for block in frame_blocks(args.audio, args.style, args.fps, size, args.seconds))
+    seconds = time.perf_counter() - start
+    print(f"numpy {args.style}: {count} frames in {seconds:.2f}s = {count / seconds:.0f} frames/s "
+          f"({count / seconds / args.fps:.1f}x real time)")
+    if args.matplotlib_frames:
+        rate = matplotlib_fps(args.audio, args.matplotlib_frames, args.fps, size)
+        print(f"matplotlib waveform: {rate:.1f} frames/s ({rate / args.fps:.2f}x real time)")
+    if args.output:
+        start = time.perf_counter()
+        write_video(args.audio, args.output, args.style, args.fps, size, args.encoder, args.seconds)
+        print(f"encoded {args.seconds:.0f}s to {args.output} with {args.encoder} "
+              f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
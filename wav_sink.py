@@ -0,0 +1,82 @@
+"""
+Incremental episode writer.
+
+Segments are appended to the output file as soon as they are generated, so
+memory stays flat no matter how long the episode is. The header is synced
+after every segment and a small ``.progress.json`` sidecar records what is
+on disk; after a crash ``resume=True`` continues where the file stops.
+"""
+import json
+import os
+
+import numpy as np
+import soundfile as sf
+
+
+class WavSink:
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.progress_path = path + ".progress.json"
+        self.completed = []
+        self.frames = 0
+        self.sample_rate = None
+        self._file = None
+
+        if resume and os.path.exists(path) and os.path.exists(self.progress_path):
+            with open(self.progress_path) as f:
+                progress = json.load(f)
+            self.completed = progress["completed"]
+            self.frames = progress["frames"]
+            self.sample_rate = progress["sample_rate"]
+
+            self._file = sf.SoundFile(path, "r+")
+            # Anything past the last recorded segment is a half-written one.
+            if self._file.frames > self.frames:
+                self._file.truncate(self.frames)
+            self._file.seek(self.frames)
+
+    def _open(self, sample_rate):
+        self.sample_rate = sample_rate
+        self._file = sf.SoundFile(self.path, "w", samplerate=sample_rate, channels=1)
+
+    def append(self, index, wav, sample_rate, pause=0.0):
+        """Write one segment plus its trailing pause and checkpoint progress."""
+        if self._file is None:
+            self._open(sample_rate)
+        elif sample_rate != self.sample_rate:
+            raise ValueError(f"Segment {index} is {sample_rate} Hz, episode is {self.sample_rate} Hz")
+
+        self._file.write(wav)
+        self.frames += len(wav)
+        if pause:
+            silence = np.zeros(int(sample_rate * pause), dtype=np.float32)
+            self._file.write(silence)
+            self.frames += len(silence)
+        self._file.flush()
+
+        self.completed.append(index)
+        self._save_progress()
+
+    def _save_progress(self):
+        tmp = self.progress_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "completed": self.completed,
+                "frames": self.frames,
+                "sample_rate": self.sample_rate,
+            }, f)
+        os.replace(tmp, self.progress_path)
+
+    def close(self, finished=True):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if finished and os.path.exists(self.progress_path):
+            os.remove(self.progress_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Keep the progress sidecar when rendering failed so it can resume.
+        self.close(finished=exc_type is None)